@@ -6,7 +6,7 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
 django.setup()
 
 # Import your models here
-from django.db.models import Q, Count, Avg
+from django.db.models import Q
 from main_app.models import Author, Article
 
 
@@ -82,12 +82,7 @@ def get_top_reviewer() -> str:
              The string format is: "Top Reviewer: [full_name] with [num_reviews] published reviews."
     """
 
-    top_reviewer = (
-        Author.objects
-        .annotate(num_reviews=Count('reviews'))
-        .order_by('-num_reviews', 'email')
-        .first()
-    )
+    top_reviewer = Author.objects.get_authors_by_review_count().first()
 
     if not top_reviewer or top_reviewer.num_reviews == 0:
         return ''
@@ -123,12 +118,8 @@ def get_latest_article() -> str:
     authors = latest_article.authors.order_by('full_name')
     author_names = ", ".join(author.full_name for author in authors)
 
-    review_stats = latest_article.reviews.aggregate(
-        num_reviews=Count('id'),
-        avg_rating=Avg('rating')
-    )
-    num_reviews = review_stats['num_reviews'] or 0
-    avg_rating = review_stats['avg_rating'] or 0
+    num_reviews = latest_article.review_count
+    avg_rating = latest_article.rating_sum / num_reviews if num_reviews else 0
 
     return (
         f"The latest article is: {latest_article.title}. "
@@ -153,18 +144,14 @@ def get_top_rated_article() -> str:
 
     top_rated_article = (
         Article.objects
-        .annotate(avg_rating=Avg('reviews__rating'))
-        .order_by('-avg_rating', 'title')
+        .get_articles_by_average_rating()
         .first()
     )
 
-    if not top_rated_article or top_rated_article.avg_rating is None:
+    if not top_rated_article:
         return ""
 
-    review_stats = top_rated_article.reviews.aggregate(
-        num_reviews=Count('id')
-    )
-    num_reviews = review_stats['num_reviews'] or 0
+    num_reviews = top_rated_article.review_count
 
     return (
         f"The top-rated article is: {top_rated_article.title}, "
@@ -173,6 +160,36 @@ def get_top_rated_article() -> str:
     )
 
 
+def search_articles(search_query: str = None, limit: int = 10) -> str:
+    """
+    This function searches the titles and contents of the articles with full-text search.
+
+    Parameters:
+        search_query (str, optional): A web-search style query, e.g. 'rocket -python "neural network"'.
+            Defaults to None.
+        limit (int, optional): The maximum number of articles returned. Defaults to 10.
+
+    Returns:
+        str: A formatted string containing the best matching articles, best match first, each with a snippet
+             of its content in which the matched words are wrapped in <b></b>.
+             If no search query is provided or no articles match, an empty string is returned.
+    """
+
+    if not search_query:
+        return ''
+
+    articles = Article.objects.search(search_query, snippets=True)[:limit]
+
+    result = []
+    for article in articles:
+        result.append(
+            f'Article: {article.title}, '
+            f'rank: {article.rank:.3f}, '
+            f'snippet: {article.snippet}'
+        )
+    return '\n'.join(result)
+
+
 def ban_author(email=None) -> str:
     """
     This function bans an author based on the provided email.
@@ -193,15 +210,12 @@ def ban_author(email=None) -> str:
     if email is None:
         return "No authors banned."
 
-    try:
-        author = Author.objects.get(email=email)
-    except Author.DoesNotExist:
+    banned = Author.objects.ban_authors([email])
+
+    if not banned:
         return "No authors banned."
 
-    num_reviews = author.reviews.count()
-    author.reviews.all().delete()
-    author.is_banned = True
-    author.save()
+    author, num_reviews = next(iter(banned.items()))
 
     return (
         f"Author: {author.full_name} is banned! "
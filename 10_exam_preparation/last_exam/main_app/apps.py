@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class MainAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main_app'
+
+    # Models populate_db does not seed: rollups and the leaderboard, which are computed from the other models
+    unseeded_models = ['ArticleDailyReviews', 'CategoryDailyReviews', 'ReviewRollupWatermark', 'AuthorLeaderboard']
+
+    def ready(self):
+        # Connect the signal handlers
+        from main_app import signals
+
+    def rebuild_derived_data(self):
+        """
+        Recomputes the review statistics, the daily rollups and the leaderboard, e.g. after populate_db seeded
+        the app with bulk inserts that bypass the handlers in main_app.signals.
+        """
+        from main_app.rollups import rebuild_review_rollups
+
+        self.get_model('Article').objects.rebuild_review_stats()
+        rebuild_review_rollups()
+        self.get_model('AuthorLeaderboard').objects.refresh()
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main_app.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Verifies the running review statistics of every article and repairs the ones that drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report drifted statistics and exit with a non-zero status if there are any.',
+        )
+
+    def handle(self, *args, **options):
+        drifted = Article.objects.with_drifted_review_stats().order_by('pk')
+
+        if options['check']:
+            for article in drifted:
+                self.stdout.write(
+                    f'Article {article.pk}: '
+                    f'reviews {article.review_count} != {article.actual_review_count}, '
+                    f'rating sum {article.rating_sum} != {article.actual_rating_sum}'
+                )
+            if drifted.exists():
+                raise CommandError('Some review statistics are out of date, run reconcile_review_stats to repair them.')
+            self.stdout.write(self.style.SUCCESS('All review statistics are correct.'))
+            return
+
+        fixed = Article.objects.rebuild_review_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the review statistics of {fixed} articles.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import AuthorLeaderboard
+
+
+class Command(BaseCommand):
+    help = (
+        'Replaces the author leaderboard snapshot with the current article and review ranks. '
+        'Meant to be run periodically, e.g. from cron.'
+    )
+
+    def handle(self, *args, **options):
+        authors = AuthorLeaderboard.objects.refresh()
+        self.stdout.write(self.style.SUCCESS(f'Ranked {authors} authors.'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from main_app.rollups import rebuild_review_rollups, roll_up_reviews
+
+
+class Command(BaseCommand):
+    help = (
+        'Adds the reviews inserted since the last run to the daily article and category rollups. '
+        'Meant to be run periodically, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='The maximum number of reviews rolled up per transaction.',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help=(
+                'Recompute the rollups from every review in one statement, '
+                'e.g. after articles changed category with QuerySet.update().'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            reviews = rebuild_review_rollups()
+        else:
+            reviews = roll_up_reviews(options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {reviews} reviews.'))
@@ -1,4 +1,19 @@
-from django.db import models
+from datetime import timedelta
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connections, models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Window
+from django.db.models.functions import Abs, Coalesce, DenseRank
+from django.utils import timezone
+
+# The text search configuration used by the article search vector trigger and by ArticleQuerySet.search()
+SEARCH_CONFIG = 'english'
+
+# The leaderboards kept by AuthorLeaderboard, as {name: (rank field, count field)}
+LEADERBOARDS = {
+    'articles': ('article_rank', 'num_articles'),
+    'reviews': ('review_rank', 'num_reviews'),
+}
 
 
 class AuthorManager(models.Manager):
@@ -7,3 +22,333 @@ class AuthorManager(models.Manager):
             self.annotate(num_articles=models.Count('articles'))
             .order_by('-num_articles', 'email')
         )
+
+    def get_authors_by_review_count(self):
+        return (
+            self.annotate(num_reviews=models.Count('reviews'))
+            .order_by('-num_reviews', 'email')
+        )
+
+    def with_leaderboard_ranks(self):
+        """
+        Annotates every author with num_articles and num_reviews, and with article_rank and review_rank,
+        their dense rank by each count (1 for the most, authors with equal counts share a rank).
+
+        This aggregates every article and review, so pages should read the AuthorLeaderboard snapshot
+        instead. The ranks are window functions over the whole table and may be filtered on,
+        e.g. with_leaderboard_ranks().filter(article_rank__lte=3).
+        """
+        article_authors = (
+            self.model.articles.through.objects
+            .filter(author_id=OuterRef('pk'))
+            .order_by()
+            .values('author_id')
+            .annotate(total=Count('*'))
+            .values('total')
+        )
+        reviews = (
+            self.model.reviews.field.model.objects
+            .filter(author_id=OuterRef('pk'))
+            .order_by()
+            .values('author_id')
+            .annotate(total=Count('*'))
+            .values('total')
+        )
+
+        return (
+            self.annotate(
+                num_articles=Coalesce(Subquery(article_authors), 0),
+                num_reviews=Coalesce(Subquery(reviews), 0),
+            )
+            .annotate(
+                article_rank=Window(DenseRank(), order_by=F('num_articles').desc()),
+                review_rank=Window(DenseRank(), order_by=F('num_reviews').desc()),
+            )
+        )
+
+    def ban_authors(self, emails, batch_size=5000):
+        """
+        Bans the authors with the given emails and deletes all their reviews in a single transaction.
+
+        Reviews are deleted with DELETE ... RETURNING statements of at most batch_size reviews each, which
+        also subtract the deleted reviews from the running statistics of their articles and from the daily
+        rollups, so no review is loaded into memory. The banned flags are then set with a single UPDATE.
+
+        Parameters:
+            emails (iterable): The emails of the authors to ban. Unknown emails are ignored.
+            batch_size (int): The maximum number of reviews deleted per statement.
+
+        Returns:
+            dict: {author: number of deleted reviews} for every banned author.
+        """
+        # Imported here, as main_app.rollups depends on the models defined with these managers
+        from main_app.rollups import release_deleted_reviews_sql, rolled_up_until
+
+        review_model = self.model.reviews.field.model
+        article_model = review_model.article.field.related_model
+
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        review_table = quote(review_model._meta.db_table)
+        article_table = quote(article_model._meta.db_table)
+
+        def column(model, name):
+            return quote(model._meta.get_field(name).column)
+
+        review_id = quote(review_model._meta.pk.column)
+        article_id = quote(article_model._meta.pk.column)
+        review_count = column(article_model, 'review_count')
+        rating_sum = column(article_model, 'rating_sum')
+
+        # The deleted rows are returned under fixed names, which release_deleted_reviews_sql() relies on
+        sql = f"""
+            WITH deleted AS (
+                DELETE FROM {review_table}
+                WHERE {review_id} IN (
+                    SELECT {review_id} FROM {review_table} WHERE {column(review_model, 'author')} = ANY(%s) LIMIT %s
+                )
+                RETURNING {review_id} AS id, {column(review_model, 'created_xid')} AS created_xid,
+                          {column(review_model, 'author')} AS author_id,
+                          {column(review_model, 'article')} AS article_id,
+                          {column(review_model, 'published_on')} AS published_on,
+                          {column(review_model, 'rating')} AS rating
+            ), articles AS (
+                UPDATE {article_table} AS article
+                SET {review_count} = article.{review_count} - stats.total,
+                    {rating_sum} = article.{rating_sum} - stats.rating
+                FROM (
+                    SELECT article_id, COUNT(*) AS total, SUM(rating) AS rating
+                    FROM deleted
+                    GROUP BY article_id
+                ) AS stats
+                WHERE article.{article_id} = stats.article_id
+            ) {release_deleted_reviews_sql('deleted')}
+            SELECT author_id, COUNT(*) FROM deleted GROUP BY author_id
+        """
+
+        with transaction.atomic(using=self.db):
+            authors = {author.pk: author for author in self.filter(email__in=list(emails))}
+            author_ids = list(authors)
+            deleted = dict.fromkeys(author_ids, 0)
+            rollup_params = [timezone.get_default_timezone_name(), *rolled_up_until()]
+
+            with connection.cursor() as cursor:
+                while author_ids:
+                    cursor.execute(sql, [author_ids, batch_size, *rollup_params])
+                    counts = cursor.fetchall()
+                    if not counts:
+                        break
+                    for author_id, count in counts:
+                        deleted[author_id] += count
+
+            self.filter(pk__in=author_ids).update(is_banned=True)
+
+        for author in authors.values():
+            author.is_banned = True
+
+        return {author: deleted[pk] for pk, author in authors.items()}
+
+
+class ArticleQuerySet(models.QuerySet):
+    def search(self, search_query, snippets=False):
+        """
+        Returns the articles matching a web-search style query (e.g. 'rocket -python "neural network"'),
+        best match first, annotated with their rank. Title matches rank above content matches.
+
+        The query is answered from the search_vector column through its GIN index; the column is kept
+        up to date by a database trigger whenever title or content change.
+
+        If snippets is True, the articles are also annotated with a snippet of their content
+        with the matched words wrapped in <b></b>.
+        """
+        query = SearchQuery(search_query, search_type='websearch', config=SEARCH_CONFIG)
+
+        articles = (
+            self.filter(search_vector=query)
+            .annotate(rank=SearchRank(F('search_vector'), query))
+            .order_by('-rank', 'id')
+        )
+
+        if snippets:
+            articles = articles.annotate(
+                snippet=SearchHeadline(
+                    'content',
+                    query,
+                    config=SEARCH_CONFIG,
+                    start_sel='<b>',
+                    stop_sel='</b>',
+                    max_words=35,
+                    min_words=15,
+                ),
+            )
+
+        return articles
+
+    def get_articles_by_average_rating(self):
+        """
+        Returns the reviewed articles annotated with avg_rating, best rated first and then by title.
+
+        The average is computed from the running review_count and rating_sum columns,
+        in the same form as the article_rating_rank index, which serves the ordering.
+        """
+        return (
+            self.filter(review_count__gt=0)
+            .annotate(avg_rating=F('rating_sum') / F('review_count'))
+            .order_by('-avg_rating', 'title')
+        )
+
+    def with_actual_review_stats(self):
+        """
+        Annotates every article with actual_review_count and actual_rating_sum,
+        computed from the reviews themselves rather than read from the stored columns.
+        """
+        reviews = (
+            self.model.reviews.field.model.objects
+            .filter(article_id=OuterRef('pk'))
+            .order_by()
+            .values('article_id')
+        )
+
+        return self.annotate(
+            actual_review_count=Coalesce(Subquery(reviews.annotate(total=Count('*')).values('total')), 0),
+            actual_rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0.0),
+        )
+
+    def with_drifted_review_stats(self, tolerance=1e-6):
+        """
+        Returns the articles whose stored review statistics differ from the actual ones.
+        Rating sums are compared with a tolerance, since repeated float additions may round differently.
+        """
+        return (
+            self.with_actual_review_stats()
+            .annotate(rating_sum_error=Abs(F('rating_sum') - F('actual_rating_sum')))
+            .filter(~Q(review_count=F('actual_review_count')) | Q(rating_sum_error__gt=tolerance))
+        )
+
+    def rebuild_review_stats(self):
+        """
+        Recomputes review_count and rating_sum of every drifted article in a single UPDATE.
+
+        Returns:
+            int: The number of articles that were corrected.
+        """
+        actual = self.with_actual_review_stats().filter(pk=OuterRef('pk'))
+
+        return (
+            self.filter(pk__in=self.with_drifted_review_stats().values('pk'))
+            .update(
+                review_count=Subquery(actual.values('actual_review_count')),
+                rating_sum=Subquery(actual.values('actual_rating_sum')),
+            )
+        )
+
+
+class ArticleManager(models.Manager.from_queryset(ArticleQuerySet)):
+    def get_queryset(self):
+        # The search vector is only read by the database, so it is not loaded with the articles
+        return super().get_queryset().defer('search_vector')
+
+
+class AuthorLeaderboardManager(models.Manager):
+    def top(self, n, by='articles'):
+        """
+        Returns the entries ranked n or better on a leaderboard, including every author tied with
+        the n-th place, best first and then by email.
+
+        The entries are read from the snapshot through the index on the rank, so only they are loaded.
+
+        Parameters:
+            n (int): The number of ranks to return.
+            by (str): The leaderboard, 'articles' or 'reviews'.
+        """
+        rank, _ = self._leaderboard(by)
+
+        return (
+            self.filter(**{f'{rank}__lte': n})
+            .select_related('author')
+            .order_by(rank, 'author__email')
+        )
+
+    def rank_of(self, author, by='articles'):
+        """
+        Returns the rank of an author on a leaderboard, or None if the author is not in the snapshot yet.
+        """
+        rank, _ = self._leaderboard(by)
+
+        return self.filter(author=author).values_list(rank, flat=True).first()
+
+    def refresh(self):
+        """
+        Replaces the snapshot with the current ranks of every author.
+
+        The ranks are computed and inserted by a single INSERT ... SELECT, so no row passes through Python.
+        The old snapshot is deleted in the same transaction, so readers see it until the new one is committed.
+
+        Returns:
+            int: The number of authors in the snapshot.
+        """
+        author_model = self.model.author.field.related_model
+        ranks = author_model.objects.db_manager(self.db).with_leaderboard_ranks().values_list(
+            'pk', 'num_articles', 'num_reviews', 'article_rank', 'review_rank',
+        )
+        ranks_sql, params = ranks.query.sql_with_params()
+
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        columns = ['author_id', 'num_articles', 'num_reviews', 'article_rank', 'review_rank', 'refreshed_at']
+        pk_column = author_model._meta.pk.column
+
+        sql = f"""
+            INSERT INTO {quote(self.model._meta.db_table)} ({', '.join(quote(column) for column in columns)})
+            SELECT ranks.{quote(pk_column)}, ranks.num_articles, ranks.num_reviews,
+                   ranks.article_rank, ranks.review_rank, %s
+            FROM ({ranks_sql}) AS ranks
+        """
+
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [timezone.now(), *params])
+                return cursor.rowcount
+
+    @staticmethod
+    def _leaderboard(by):
+        try:
+            return LEADERBOARDS[by]
+        except KeyError:
+            raise ValueError(f'Unknown leaderboard {by!r}, expected one of {", ".join(LEADERBOARDS)}.') from None
+
+
+class DailyReviewsQuerySet(models.QuerySet):
+    def last_days(self, days):
+        """
+        Returns the rollups of the last given number of days, today included.
+
+        The rollups only include reviews processed by the rollup job, so the current day is usually incomplete.
+        """
+        return self.filter(day__gt=timezone.localdate() - timedelta(days=days))
+
+    def between(self, start, end):
+        """
+        Returns the rollups of the days from start to end, both included.
+        """
+        return self.filter(day__range=(start, end))
+
+    def totals(self, *fields):
+        """
+        Groups the rollups by the given fields and annotates every group with num_reviews, total_rating
+        and avg_rating. Groups without reviews are left out.
+
+        Example:
+            CategoryDailyReviews.objects.last_days(30).totals('category')
+        """
+        return (
+            self.values(*fields)
+            .annotate(num_reviews=Sum('review_count'), total_rating=Sum('rating_sum'))
+            .filter(num_reviews__gt=0)
+            .annotate(avg_rating=F('total_rating') / F('num_reviews'))
+            .order_by(*fields)
+        )
+
+
+DailyReviewsManager = models.Manager.from_queryset(DailyReviewsQuerySet)
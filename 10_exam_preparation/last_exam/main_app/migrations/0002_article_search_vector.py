@@ -0,0 +1,49 @@
+# Generated by Django 5.0.4 on 2026-10-17 03:55
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Title lexemes get weight A and content lexemes weight B, so title matches rank higher.
+# The trigger only fires when an UPDATE sets title or content, e.g. not for counter updates.
+CREATE_TRIGGER = """
+CREATE FUNCTION main_app_article_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.content, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER main_app_article_search_vector
+    BEFORE INSERT OR UPDATE OF title, content ON main_app_article
+    FOR EACH ROW EXECUTE FUNCTION main_app_article_search_vector_update();
+
+UPDATE main_app_article SET title = title;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER main_app_article_search_vector ON main_app_article;
+DROP FUNCTION main_app_article_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='article_search_vector'),
+        ),
+    ]
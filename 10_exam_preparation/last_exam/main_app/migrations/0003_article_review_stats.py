@@ -0,0 +1,52 @@
+# Generated by Django 5.0.4 on 2026-10-17 03:56
+
+import django.db.models.expressions
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_review_stats(apps, schema_editor):
+    Article = apps.get_model('main_app', 'Article')
+    Review = apps.get_model('main_app', 'Review')
+
+    reviews = (
+        Review.objects
+        .filter(article_id=OuterRef('pk'))
+        .order_by()
+        .values('article_id')
+    )
+
+    Article.objects.update(
+        review_count=Coalesce(Subquery(reviews.annotate(total=Count('*')).values('total')), 0),
+        rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0.0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_article_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='rating_sum',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='review_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_review_stats, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(models.OrderBy(django.db.models.expressions.CombinedExpression(models.F('rating_sum'), '/', models.F('review_count')), descending=True), models.F('title'), condition=models.Q(('review_count__gt', 0)), name='article_rating_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-published_on'], name='article_latest'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.4 on 2026-10-17 03:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_article_review_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorLeaderboard',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='leaderboard', serialize=False, to='main_app.author')),
+                ('num_articles', models.IntegerField()),
+                ('num_reviews', models.IntegerField()),
+                ('article_rank', models.IntegerField()),
+                ('review_rank', models.IntegerField()),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['article_rank'], name='leaderboard_article_rank'), models.Index(fields=['review_rank'], name='leaderboard_review_rank')],
+            },
+        ),
+    ]
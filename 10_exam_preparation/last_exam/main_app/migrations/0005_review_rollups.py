@@ -0,0 +1,64 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_watermark(apps, schema_editor):
+    ReviewRollupWatermark = apps.get_model('main_app', 'ReviewRollupWatermark')
+    ReviewRollupWatermark.objects.create()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_author_leaderboard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleDailyReviews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.FloatField(default=0.0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CategoryDailyReviews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('Technology', 'Technology'), ('Science', 'Science'), ('Education', 'Education')], max_length=10)),
+                ('day', models.DateField()),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.FloatField(default=0.0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReviewRollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_review_id', models.BigIntegerField(default=0)),
+                ('rolled_up_at', models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['published_on'], name='review_published_on'),
+        ),
+        migrations.AddField(
+            model_name='articledailyreviews',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_reviews', to='main_app.article'),
+        ),
+        migrations.AddConstraint(
+            model_name='categorydailyreviews',
+            constraint=models.UniqueConstraint(fields=('day', 'category'), name='category_daily_reviews_day'),
+        ),
+        migrations.AddConstraint(
+            model_name='articledailyreviews',
+            constraint=models.UniqueConstraint(fields=('article', 'day'), name='article_daily_reviews_day'),
+        ),
+        migrations.RunPython(create_watermark, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:16
+
+from django.db import migrations, models
+
+
+def mark_existing_reviews(apps, schema_editor):
+    # The existing reviews were all committed, so they keep their place in the review id watermark
+    Review = apps.get_model('main_app', 'Review')
+    Review.objects.update(created_xid=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_review_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='created_xid',
+            field=models.BigIntegerField(db_default=models.Func(output_field=models.BigIntegerField(), template='pg_current_xact_id()::text::bigint'), editable=False),
+        ),
+        migrations.RunPython(mark_existing_reviews, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='reviewrollupwatermark',
+            name='last_xid',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['created_xid', 'id'], name='review_rollup_position'),
+        ),
+    ]
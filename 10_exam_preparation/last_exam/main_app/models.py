@@ -1,8 +1,11 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core import validators
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
 
 from main_app.choices import ArticleCategoryChoices
-from main_app.managers import AuthorManager
+from main_app.managers import AuthorManager, ArticleManager, AuthorLeaderboardManager, DailyReviewsManager
 
 
 # Create your models here.
@@ -37,6 +40,40 @@ class Author(models.Model):
     objects = AuthorManager()
 
 
+# Snapshot of Author.objects.with_leaderboard_ranks(), replaced by the refresh_leaderboard command
+class AuthorLeaderboard(models.Model):
+    author = models.OneToOneField(
+        to=Author,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='leaderboard',
+    )
+
+    num_articles = models.IntegerField()
+
+    num_reviews = models.IntegerField()
+
+    article_rank = models.IntegerField()
+
+    review_rank = models.IntegerField()
+
+    refreshed_at = models.DateTimeField()
+
+    objects = AuthorLeaderboardManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['article_rank'],
+                name='leaderboard_article_rank',
+            ),
+            models.Index(
+                fields=['review_rank'],
+                name='leaderboard_review_rank',
+            ),
+        ]
+
+
 class Article(models.Model):
     title = models.CharField(
         max_length=200,
@@ -67,6 +104,48 @@ class Article(models.Model):
         editable=False,
     )
 
+    # Weighted title and content lexemes, maintained by the main_app_article_search_vector trigger
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+
+    # Running review statistics, maintained by the handlers in main_app.signals
+    review_count = models.IntegerField(
+        default=0,
+        editable=False,
+    )
+
+    rating_sum = models.FloatField(
+        default=0.0,
+        editable=False,
+    )
+
+    objects = ArticleManager()
+
+    def save(self, *args, **kwargs):
+        # The handlers in main_app.signals that move the category rollups must commit or roll back with the article
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=['search_vector'],
+                name='article_search_vector',
+            ),
+            models.Index(
+                (F('rating_sum') / F('review_count')).desc(),
+                F('title'),
+                condition=Q(review_count__gt=0),
+                name='article_rating_rank',
+            ),
+            models.Index(
+                fields=['-published_on'],
+                name='article_latest',
+            ),
+        ]
+
 
 class Review(models.Model):
     content = models.TextField(
@@ -98,3 +177,101 @@ class Review(models.Model):
         auto_now_add=True,
         editable=False,
     )
+
+    # The transaction that inserted the review, which main_app.rollups waits for before rolling it up
+    created_xid = models.BigIntegerField(
+        db_default=models.Func(
+            template='pg_current_xact_id()::text::bigint',
+            output_field=models.BigIntegerField(),
+        ),
+        editable=False,
+    )
+
+    def save(self, *args, **kwargs):
+        # The article statistics handlers in main_app.signals must commit or roll back together with the review
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['published_on'],
+                name='review_published_on',
+            ),
+            models.Index(
+                fields=['created_xid', 'id'],
+                name='review_rollup_position',
+            ),
+        ]
+
+
+# Review counts and rating sums per article and day, maintained by main_app.rollups
+class ArticleDailyReviews(models.Model):
+    article = models.ForeignKey(
+        to=Article,
+        on_delete=models.CASCADE,
+        related_name='daily_reviews',
+    )
+
+    day = models.DateField()
+
+    review_count = models.IntegerField(
+        default=0,
+    )
+
+    rating_sum = models.FloatField(
+        default=0.0,
+    )
+
+    objects = DailyReviewsManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['article', 'day'],
+                name='article_daily_reviews_day',
+            ),
+        ]
+
+
+# Review counts and rating sums per article category and day, maintained by main_app.rollups
+class CategoryDailyReviews(models.Model):
+    category = models.CharField(
+        max_length=10,
+        choices=ArticleCategoryChoices.choices,
+    )
+
+    day = models.DateField()
+
+    review_count = models.IntegerField(
+        default=0,
+    )
+
+    rating_sum = models.FloatField(
+        default=0.0,
+    )
+
+    objects = DailyReviewsManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'category'],
+                name='category_daily_reviews_day',
+            ),
+        ]
+
+
+# The (created_xid, id) position of the last review included in the daily rollups; a single row created by the migration
+class ReviewRollupWatermark(models.Model):
+    last_xid = models.BigIntegerField(
+        default=0,
+    )
+
+    last_review_id = models.BigIntegerField(
+        default=0,
+    )
+
+    rolled_up_at = models.DateTimeField(
+        null=True,
+    )
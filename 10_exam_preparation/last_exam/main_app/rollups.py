@@ -0,0 +1,290 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+from main_app.models import Article, ArticleDailyReviews, CategoryDailyReviews, Review, ReviewRollupWatermark
+
+
+def _names():
+    quote = connection.ops.quote_name
+
+    def column(model, name):
+        return quote(model._meta.get_field(name).column)
+
+    return {
+        'review': quote(Review._meta.db_table),
+        'article': quote(Article._meta.db_table),
+        'article_daily': quote(ArticleDailyReviews._meta.db_table),
+        'category_daily': quote(CategoryDailyReviews._meta.db_table),
+        'watermark': quote(ReviewRollupWatermark._meta.db_table),
+        'review_id': quote(Review._meta.pk.column),
+        'review_xid': column(Review, 'created_xid'),
+        'review_article': column(Review, 'article'),
+        'review_published_on': column(Review, 'published_on'),
+        'review_rating': column(Review, 'rating'),
+        'article_id': quote(Article._meta.pk.column),
+        'article_category': column(Article, 'category'),
+        'article_daily_article': column(ArticleDailyReviews, 'article'),
+        'article_daily_day': column(ArticleDailyReviews, 'day'),
+        'article_daily_count': column(ArticleDailyReviews, 'review_count'),
+        'article_daily_rating': column(ArticleDailyReviews, 'rating_sum'),
+        'category_daily_category': column(CategoryDailyReviews, 'category'),
+        'category_daily_day': column(CategoryDailyReviews, 'day'),
+        'category_daily_count': column(CategoryDailyReviews, 'review_count'),
+        'category_daily_rating': column(CategoryDailyReviews, 'rating_sum'),
+        'watermark_xid': column(ReviewRollupWatermark, 'last_xid'),
+        'watermark_review': column(ReviewRollupWatermark, 'last_review_id'),
+    }
+
+
+def rolled_up_until():
+    """
+    Returns the (created_xid, id) position of the last review included in the daily rollups.
+
+    The watermark is locked FOR SHARE until the current transaction ends, so review changes do not
+    wait for each other, but the rollup job cannot move the watermark until they commit.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT {watermark_xid}, {watermark_review} FROM {watermark} FOR SHARE'.format(**_names()))
+        position = cursor.fetchone()
+
+    return tuple(position) if position else (0, 0)
+
+
+def is_rolled_up(review):
+    """
+    Returns whether the daily rollups include the review, locking the watermark like rolled_up_until().
+    """
+    return (review.created_xid, review.pk) <= rolled_up_until()
+
+
+def review_day(published_on):
+    """
+    Returns the day a review is rolled up under, in the default time zone like the rollup job.
+    """
+    return timezone.localtime(published_on, timezone.get_default_timezone()).date()
+
+
+def _lock_watermark():
+    watermark = ReviewRollupWatermark.objects.select_for_update().first()
+
+    return watermark or ReviewRollupWatermark.objects.create()
+
+
+def _finished_before(cursor):
+    # Every transaction with a lower id has committed or rolled back, so no review below it can still appear
+    cursor.execute('SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint')
+
+    return cursor.fetchone()[0]
+
+
+def _roll_up(cursor, start, stop):
+    """
+    Adds the reviews after the start position up to and including the stop position to the daily rollups.
+
+    Returns:
+        int: The number of reviews rolled up.
+    """
+    sql = """
+        WITH batch AS (
+            SELECT review.{review_article} AS article_id, article.{article_category} AS category,
+                   (review.{review_published_on} AT TIME ZONE %s)::date AS day, review.{review_rating} AS rating
+            FROM {review} AS review
+            JOIN {article} AS article ON article.{article_id} = review.{review_article}
+            WHERE (review.{review_xid}, review.{review_id}) > (%s, %s)
+              AND (review.{review_xid}, review.{review_id}) <= (%s, %s)
+        ), articles AS (
+            INSERT INTO {article_daily} AS daily
+                ({article_daily_article}, {article_daily_day}, {article_daily_count}, {article_daily_rating})
+            SELECT article_id, day, COUNT(*), SUM(rating) FROM batch GROUP BY article_id, day
+            ON CONFLICT ({article_daily_article}, {article_daily_day}) DO UPDATE
+            SET {article_daily_count} = daily.{article_daily_count} + EXCLUDED.{article_daily_count},
+                {article_daily_rating} = daily.{article_daily_rating} + EXCLUDED.{article_daily_rating}
+        ), categories AS (
+            INSERT INTO {category_daily} AS daily
+                ({category_daily_category}, {category_daily_day}, {category_daily_count}, {category_daily_rating})
+            SELECT category, day, COUNT(*), SUM(rating) FROM batch GROUP BY category, day
+            ON CONFLICT ({category_daily_day}, {category_daily_category}) DO UPDATE
+            SET {category_daily_count} = daily.{category_daily_count} + EXCLUDED.{category_daily_count},
+                {category_daily_rating} = daily.{category_daily_rating} + EXCLUDED.{category_daily_rating}
+        )
+        SELECT COUNT(*) FROM batch
+    """.format(**_names())
+
+    cursor.execute(sql, [timezone.get_default_timezone_name(), *start, *stop])
+
+    return cursor.fetchone()[0]
+
+
+def roll_up_reviews(batch_size=5000):
+    """
+    Adds the reviews inserted since the watermark to the daily rollups and moves the watermark past them.
+
+    Reviews are rolled up in (created_xid, id) order, and only those inserted by transactions older than
+    the oldest one still running, so a review can never commit behind the watermark. A long running
+    transaction therefore holds the rollups back until it ends, but no review is skipped.
+
+    Every batch is read, added with INSERT ... ON CONFLICT DO UPDATE and recorded in the watermark
+    by one transaction, so an interrupted job continues with the first batch that was not committed.
+
+    Parameters:
+        batch_size (int): The maximum number of reviews rolled up per transaction.
+
+    Returns:
+        int: The number of reviews rolled up.
+    """
+    pending_sql = """
+        SELECT {review_xid}, {review_id} FROM {review}
+        WHERE ({review_xid}, {review_id}) > (%s, %s) AND {review_xid} < %s
+        ORDER BY {review_xid}, {review_id}
+        LIMIT %s
+    """.format(**_names())
+
+    rolled_up = 0
+
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            finished_before = _finished_before(cursor)
+            watermark = _lock_watermark()
+            start = (watermark.last_xid, watermark.last_review_id)
+
+            cursor.execute(pending_sql, [*start, finished_before, batch_size])
+            pending = cursor.fetchall()
+            if not pending:
+                return rolled_up
+
+            stop = pending[-1]
+            rolled_up += _roll_up(cursor, start, stop)
+
+            ReviewRollupWatermark.objects.filter(pk=watermark.pk).update(
+                last_xid=stop[0],
+                last_review_id=stop[1],
+                rolled_up_at=timezone.now(),
+            )
+
+
+def rebuild_review_rollups():
+    """
+    Recomputes the daily rollups from every finished review with a single statement and transaction,
+    e.g. after articles were moved to another category with QuerySet.update(). Readers see the old
+    rollups until it commits; review changes wait for it like for a batch of the rollup job.
+
+    Returns:
+        int: The number of reviews rolled up.
+    """
+    last_sql = """
+        SELECT {review_xid}, {review_id} FROM {review}
+        WHERE {review_xid} < %s
+        ORDER BY {review_xid} DESC, {review_id} DESC
+        LIMIT 1
+    """.format(**_names())
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        finished_before = _finished_before(cursor)
+        watermark = _lock_watermark()
+
+        ArticleDailyReviews.objects.all().delete()
+        CategoryDailyReviews.objects.all().delete()
+
+        cursor.execute(last_sql, [finished_before])
+        stop = cursor.fetchone() or (0, 0)
+        rolled_up = _roll_up(cursor, (0, 0), stop)
+
+        ReviewRollupWatermark.objects.filter(pk=watermark.pk).update(
+            last_xid=stop[0],
+            last_review_id=stop[1],
+            rolled_up_at=timezone.now(),
+        )
+
+    return rolled_up
+
+
+def change_daily_reviews(article_id, day, count_delta, rating_delta):
+    """
+    Adds the given deltas to the rollups of an article and its current category on a day,
+    creating them if a review was moved to an article or category without reviews on that day.
+    """
+    sql = """
+        WITH articles AS (
+            INSERT INTO {article_daily} AS daily
+                ({article_daily_article}, {article_daily_day}, {article_daily_count}, {article_daily_rating})
+            VALUES (%(article_id)s, %(day)s, %(count)s, %(rating)s)
+            ON CONFLICT ({article_daily_article}, {article_daily_day}) DO UPDATE
+            SET {article_daily_count} = daily.{article_daily_count} + EXCLUDED.{article_daily_count},
+                {article_daily_rating} = daily.{article_daily_rating} + EXCLUDED.{article_daily_rating}
+        )
+        INSERT INTO {category_daily} AS daily
+            ({category_daily_category}, {category_daily_day}, {category_daily_count}, {category_daily_rating})
+        SELECT {article_category}, %(day)s, %(count)s, %(rating)s FROM {article} WHERE {article_id} = %(article_id)s
+        ON CONFLICT ({category_daily_day}, {category_daily_category}) DO UPDATE
+        SET {category_daily_count} = daily.{category_daily_count} + EXCLUDED.{category_daily_count},
+            {category_daily_rating} = daily.{category_daily_rating} + EXCLUDED.{category_daily_rating}
+    """.format(**_names())
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {'article_id': article_id, 'day': day, 'count': count_delta, 'rating': rating_delta})
+
+
+def move_category_reviews(article_id, old_category, new_category):
+    """
+    Moves the rolled up reviews of an article from the category rollups of old_category to new_category.
+    The caller must hold the watermark lock, e.g. from rolled_up_until(), so the article rollups match.
+    """
+    sql = """
+        WITH moved AS (
+            SELECT {article_daily_day} AS day, {article_daily_count} AS total, {article_daily_rating} AS rating
+            FROM {article_daily}
+            WHERE {article_daily_article} = %s
+        ), released AS (
+            UPDATE {category_daily} AS daily
+            SET {category_daily_count} = daily.{category_daily_count} - moved.total,
+                {category_daily_rating} = daily.{category_daily_rating} - moved.rating
+            FROM moved
+            WHERE daily.{category_daily_category} = %s AND daily.{category_daily_day} = moved.day
+        )
+        INSERT INTO {category_daily} AS daily
+            ({category_daily_category}, {category_daily_day}, {category_daily_count}, {category_daily_rating})
+        SELECT %s, day, total, rating FROM moved
+        ON CONFLICT ({category_daily_day}, {category_daily_category}) DO UPDATE
+        SET {category_daily_count} = daily.{category_daily_count} + EXCLUDED.{category_daily_count},
+            {category_daily_rating} = daily.{category_daily_rating} + EXCLUDED.{category_daily_rating}
+    """.format(**_names())
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [article_id, old_category, new_category])
+
+
+def release_deleted_reviews_sql(deleted):
+    """
+    Returns the CTEs that subtract the rolled up reviews among the rows of a DELETE ... RETURNING id,
+    created_xid, article_id, published_on, rating named deleted from the daily rollups, to be appended
+    to its WITH clause.
+
+    Their parameters are the default time zone name and the two values of rolled_up_until(), in that order.
+    """
+    return """
+        , released AS (
+            SELECT gone.article_id, article.{article_category} AS category,
+                   (gone.published_on AT TIME ZONE %s)::date AS day, COUNT(*) AS total, SUM(gone.rating) AS rating
+            FROM {deleted} AS gone
+            JOIN {article} AS article ON article.{article_id} = gone.article_id
+            WHERE (gone.created_xid, gone.id) <= (%s, %s)
+            GROUP BY gone.article_id, article.{article_category}, day
+        ), released_articles AS (
+            UPDATE {article_daily} AS daily
+            SET {article_daily_count} = daily.{article_daily_count} - released.total,
+                {article_daily_rating} = daily.{article_daily_rating} - released.rating
+            FROM released
+            WHERE daily.{article_daily_article} = released.article_id AND daily.{article_daily_day} = released.day
+        ), released_categories AS (
+            UPDATE {category_daily} AS daily
+            SET {category_daily_count} = daily.{category_daily_count} - per_category.total,
+                {category_daily_rating} = daily.{category_daily_rating} - per_category.rating
+            FROM (
+                SELECT category, day, SUM(total) AS total, SUM(rating) AS rating
+                FROM released
+                GROUP BY category, day
+            ) AS per_category
+            WHERE daily.{category_daily_category} = per_category.category
+              AND daily.{category_daily_day} = per_category.day
+        )
+    """.format(deleted=deleted, **_names())
@@ -0,0 +1,99 @@
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from main_app.models import Article, Review
+from main_app.rollups import change_daily_reviews, is_rolled_up, move_category_reviews, review_day, rolled_up_until
+
+
+def change_review_stats(article_id, count_delta, rating_delta):
+    """
+    Adds the given deltas to the running review statistics of an article.
+    """
+    Article.objects.filter(pk=article_id).update(
+        review_count=F('review_count') + count_delta,
+        rating_sum=F('rating_sum') + rating_delta,
+    )
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, **kwargs):
+    previous = (
+        Review.objects
+        .filter(pk=instance.pk)
+        .values_list('article_id', 'rating', 'created_xid')
+        .first()
+    ) if instance.pk else None
+
+    instance._previous_article_id, instance._previous_rating, created_xid = previous or (None, None, None)
+    if created_xid is not None:
+        # An unsaved instance with an existing pk would otherwise reset it to the updating transaction
+        instance.created_xid = created_xid
+
+
+@receiver(post_save, sender=Review)
+def update_review_stats(sender, instance, created, **kwargs):
+    previous_article_id = getattr(instance, '_previous_article_id', None)
+    previous_rating = getattr(instance, '_previous_rating', None)
+
+    if previous_article_id is None:
+        change_review_stats(instance.article_id, 1, instance.rating)
+    elif previous_article_id != instance.article_id:
+        change_review_stats(previous_article_id, -1, -previous_rating)
+        change_review_stats(instance.article_id, 1, instance.rating)
+    elif previous_rating != instance.rating:
+        change_review_stats(instance.article_id, 0, instance.rating - previous_rating)
+
+
+@receiver(post_delete, sender=Review)
+def release_review_stats(sender, instance, **kwargs):
+    change_review_stats(instance.article_id, -1, -instance.rating)
+
+
+@receiver(post_save, sender=Review)
+def update_daily_reviews(sender, instance, created, **kwargs):
+    # New reviews are added by the rollup job; changes only need to reach the rollups that already include them
+    previous_article_id = getattr(instance, '_previous_article_id', None)
+    previous_rating = getattr(instance, '_previous_rating', None)
+
+    if previous_article_id is None or not is_rolled_up(instance):
+        return
+
+    day = review_day(instance.published_on)
+
+    if previous_article_id != instance.article_id:
+        change_daily_reviews(previous_article_id, day, -1, -previous_rating)
+        change_daily_reviews(instance.article_id, day, 1, instance.rating)
+    elif previous_rating != instance.rating:
+        change_daily_reviews(instance.article_id, day, 0, instance.rating - previous_rating)
+
+
+@receiver(post_delete, sender=Review)
+def release_daily_reviews(sender, instance, **kwargs):
+    if is_rolled_up(instance):
+        change_daily_reviews(instance.article_id, review_day(instance.published_on), -1, -instance.rating)
+
+
+@receiver(pre_save, sender=Article)
+def remember_previous_category(sender, instance, **kwargs):
+    instance._previous_category = (
+        Article.objects
+        .filter(pk=instance.pk)
+        .values_list('category', flat=True)
+        .first()
+    ) if instance.pk else None
+
+
+@receiver(post_save, sender=Article)
+def move_daily_reviews(sender, instance, update_fields, **kwargs):
+    # Articles moved with QuerySet.update() bypass this handler and need rebuild_review_rollups()
+    previous_category = getattr(instance, '_previous_category', None)
+
+    if previous_category is None or previous_category == instance.category:
+        return
+    if update_fields is not None and 'category' not in update_fields:
+        return
+
+    # Locks the watermark, so no rollup batch adds reviews of the article while they are moved
+    rolled_up_until()
+    move_category_reviews(instance.pk, previous_category, instance.category)
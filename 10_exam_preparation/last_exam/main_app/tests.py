@@ -1,3 +1,152 @@
-from django.test import TestCase
+import threading
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from main_app.choices import ArticleCategoryChoices
+from main_app.models import Article, ArticleDailyReviews, Author, CategoryDailyReviews, Review
+from main_app.rollups import rebuild_review_rollups, roll_up_reviews
+
+
+@skipUnless(connection.vendor == 'postgresql', 'The rollups use PostgreSQL transaction ids')
+class ReviewRollupTests(TransactionTestCase):
+    """
+    Checks that the rollup job, the review and article handlers and ban_authors() keep the daily
+    rollups equal to the reviews they include. The job only rolls up committed transactions,
+    so these tests commit instead of running in a rolled back transaction.
+    """
+
+    def setUp(self):
+        self.author = Author.objects.create(full_name='Jane Doe', email='jane@example.com', birth_year=1990)
+        self.other_author = Author.objects.create(full_name='John Doe', email='john@example.com', birth_year=1985)
+        self.technology = Article.objects.create(
+            title='Technology article',
+            content='Technology content',
+            category=ArticleCategoryChoices.TECHNOLOGY,
+        )
+        self.science = Article.objects.create(
+            title='Science article',
+            content='Science content',
+            category=ArticleCategoryChoices.SCIENCE,
+        )
+
+    def create_review(self, article, rating, author=None):
+        return Review.objects.create(
+            content='A review long enough',
+            rating=rating,
+            author=author or self.author,
+            article=article,
+        )
+
+    def assertRollupsMatchReviews(self):
+        days = Review.objects.annotate(day=TruncDate('published_on', tzinfo=timezone.get_default_timezone()))
+
+        def totals(rows, *keys):
+            return {
+                tuple(row[key] for key in keys): (row['num_reviews'], row['total_rating'])
+                for row in rows if row['num_reviews']
+            }
+
+        self.assertEqual(
+            totals(ArticleDailyReviews.objects.totals('article_id', 'day'), 'article_id', 'day'),
+            totals(days.values('article_id', 'day').annotate(
+                num_reviews=Count('pk'), total_rating=Sum('rating'),
+            ), 'article_id', 'day'),
+        )
+        self.assertEqual(
+            totals(CategoryDailyReviews.objects.totals('category', 'day'), 'category', 'day'),
+            totals(days.values('day', category=F('article__category')).annotate(
+                num_reviews=Count('pk'), total_rating=Sum('rating'),
+            ), 'category', 'day'),
+        )
+
+    def test_job_rolls_up_new_reviews_once(self):
+        self.create_review(self.technology, 4)
+        self.create_review(self.science, 2)
+
+        self.assertEqual(roll_up_reviews(batch_size=1), 2)
+        self.assertEqual(roll_up_reviews(), 0)
+        self.assertRollupsMatchReviews()
+
+    def test_job_waits_for_running_transactions(self):
+        inserted, finish = threading.Event(), threading.Event()
+
+        def insert_slowly():
+            with transaction.atomic():
+                self.create_review(self.technology, 5)
+                inserted.set()
+                finish.wait()
+            connection.close()
+
+        thread = threading.Thread(target=insert_slowly)
+        thread.start()
+        inserted.wait()
+        try:
+            self.create_review(self.science, 1)
+            self.assertEqual(roll_up_reviews(), 0)
+        finally:
+            finish.set()
+            thread.join()
+
+        self.assertEqual(roll_up_reviews(), 2)
+        self.assertRollupsMatchReviews()
+
+    def test_review_changes_update_rolled_up_reviews(self):
+        review = self.create_review(self.technology, 4)
+        removed = self.create_review(self.technology, 3)
+        roll_up_reviews()
+
+        review.rating = 2
+        review.save()
+        review.article = self.science
+        review.save()
+        removed.delete()
+
+        self.assertRollupsMatchReviews()
+
+    def test_review_changes_skip_pending_reviews(self):
+        roll_up_reviews()
+        review = self.create_review(self.technology, 4)
+        review.rating = 1
+        review.save()
+
+        self.assertFalse(CategoryDailyReviews.objects.exists())
+        self.assertEqual(roll_up_reviews(), 1)
+        self.assertRollupsMatchReviews()
+
+    def test_category_change_moves_rolled_up_reviews(self):
+        self.create_review(self.technology, 4)
+        self.create_review(self.science, 2)
+        roll_up_reviews()
+
+        self.technology.category = ArticleCategoryChoices.EDUCATION
+        self.technology.save()
+        self.science.category = ArticleCategoryChoices.EDUCATION
+        self.science.save()
+
+        self.assertRollupsMatchReviews()
+
+    def test_ban_authors_releases_rolled_up_reviews(self):
+        self.create_review(self.technology, 4)
+        self.create_review(self.science, 3, author=self.other_author)
+        roll_up_reviews()
+        self.create_review(self.science, 5)
+
+        deleted = Author.objects.ban_authors([self.author.email], batch_size=1)
+
+        self.assertEqual(deleted, {self.author: 2})
+        self.assertEqual(roll_up_reviews(), 0)
+        self.assertRollupsMatchReviews()
+
+    def test_rebuild_matches_job(self):
+        self.create_review(self.technology, 4)
+        self.create_review(self.science, 2)
+        Article.objects.update(category=ArticleCategoryChoices.EDUCATION)
+
+        self.assertEqual(rebuild_review_rollups(), 2)
+        self.assertEqual(roll_up_reviews(), 0)
+        self.assertRollupsMatchReviews()
@@ -0,0 +1,21 @@
+"""
+Test settings for orm_skeleton project.
+
+Usage:
+    python manage.py test --settings=orm_skeleton.test_settings --parallel
+
+The migrations are applied once into a template database, which is reused until a migration file
+changes; every test run and parallel worker database is cloned from it. The app relies on PostgreSQL
+(a full-text search trigger in the migrations, PostgreSQL-only SQL in the queries), so there is no SQLite mode.
+"""
+
+from .settings import *
+
+TEST_RUNNER = 'orm_skeleton.test_runner.TemplateDatabaseTestRunner'
+
+# Hashing with the default hasher dominates the run time of tests that create users
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+DEBUG = False
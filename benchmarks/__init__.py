@@ -0,0 +1,11 @@
+# The runner imports Django's ORM, so it is loaded lazily and "python -m benchmarks" can import
+# the caller module (which sets Django up) first, see __main__.py
+__all__ = ['run_benchmarks', 'benchmark_function', 'compare_results', 'check_benchmark_database']
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import runner
+        return getattr(runner, name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
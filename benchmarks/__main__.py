@@ -0,0 +1,68 @@
+"""
+Usage, from a project directory (next to manage.py), with the repository root on PYTHONPATH:
+
+    python -m benchmarks run caller --sizes 1000 100000 --output results.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.2
+
+'run' flushes the default database, so it must point to a dedicated database whose name contains
+'bench' (e.g. through a settings module selected with DJANGO_SETTINGS_MODULE), unless --yes-flush is given.
+"""
+import argparse
+import importlib
+import sys
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='seed the database and benchmark a caller module')
+    run_parser.add_argument('module', nargs='?', default='caller')
+    run_parser.add_argument('--sizes', nargs='+', type=int, default=[1_000, 100_000, 1_000_000])
+    run_parser.add_argument('--method', choices=['bulk', 'copy', 'parallel'], default='bulk')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--output', default='benchmark_results.json')
+    run_parser.add_argument(
+        '--yes-flush',
+        action='store_true',
+        help='flush the database even if its name does not mark it as a benchmark database',
+    )
+
+    compare_parser = subparsers.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+
+    args = parser.parse_args()
+
+    # The caller modules set up Django themselves, so they are imported before the runner
+    if args.command == 'run':
+        module = importlib.import_module(args.module)
+
+        from .runner import run_benchmarks
+        run_benchmarks(
+            module,
+            args.sizes,
+            method=args.method,
+            repeat=args.repeat,
+            output=args.output,
+            allow_flush=args.yes_flush,
+        )
+        return 0
+
+    from .runner import compare_results
+    regressions = compare_results(args.baseline, args.current, args.threshold)
+    for regression in regressions:
+        old_time, new_time = regression['wall_time']
+        old_queries, new_queries = regression['queries']
+        print(
+            f"{regression['size']:>9} {regression['function']:<45} "
+            f"{old_time * 1000:.2f} -> {new_time * 1000:.2f} ms, "
+            f"{old_queries} -> {new_queries} queries"
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
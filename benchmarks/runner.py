@@ -0,0 +1,242 @@
+import datetime
+import inspect
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connections, transaction, DEFAULT_DB_ALIAS
+
+from populate_db import populate_app_with_data
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+# run_benchmarks() only flushes databases whose name contains this, unless told otherwise
+BENCHMARK_DATABASE_MARKER = 'bench'
+
+
+def benchmark_function(function, args=(), kwargs=None, repeat=3, using=DEFAULT_DB_ALIAS):
+    """
+    Times a single query function.
+
+    Every run happens inside a transaction that is rolled back afterwards, so functions that
+    modify data see the same dataset on every run. The timed runs are made without tracemalloc;
+    one extra run collects the query count, rows fetched and peak memory.
+
+    Parameters:
+        function: The function to benchmark.
+        args (tuple): Positional arguments for the function.
+        kwargs (dict): Keyword arguments for the function.
+        repeat (int): The number of timed runs.
+        using (str): The database alias the function queries.
+
+    Returns:
+        dict: wall_time (min/median seconds), queries, rows and peak_memory (bytes).
+    """
+    if kwargs is None:
+        kwargs = {}
+
+    timings = []
+    for _ in range(repeat):
+        with transaction.atomic(using=using):
+            start = time.perf_counter()
+            function(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+            transaction.set_rollback(True, using=using)
+
+    counters = {'queries': 0, 'rows': 0}
+
+    def wrapper(execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        counters['queries'] += 1
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH')) and context['cursor'].rowcount > 0:
+            counters['rows'] += context['cursor'].rowcount
+        return result
+
+    with transaction.atomic(using=using):
+        with connections[using].execute_wrapper(wrapper):
+            tracemalloc.start()
+            try:
+                function(*args, **kwargs)
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        transaction.set_rollback(True, using=using)
+
+    return {
+        'wall_time': {
+            'min': min(timings),
+            'median': statistics.median(timings),
+        },
+        'queries': counters['queries'],
+        'rows': counters['rows'],
+        'peak_memory': peak_memory,
+    }
+
+
+def public_functions(module):
+    """
+    Returns {name: function} for the public functions defined in a caller module.
+    """
+    return {
+        name: function
+        for name, function in inspect.getmembers(module, inspect.isfunction)
+        if not name.startswith('_') and function.__module__ == module.__name__
+    }
+
+
+def _has_required_parameters(function):
+    return any(
+        parameter.default is parameter.empty
+        and parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)
+        for parameter in inspect.signature(function).parameters.values()
+    )
+
+
+def check_benchmark_database(using=DEFAULT_DB_ALIAS):
+    """
+    Raises ImproperlyConfigured unless the name of the database looks like a dedicated benchmark
+    database, e.g. 'exam_benchmark', since run_benchmarks() deletes all of its data.
+    """
+    name = str(connections[using].settings_dict['NAME'])
+
+    if BENCHMARK_DATABASE_MARKER not in name.lower():
+        raise ImproperlyConfigured(
+            f'Refusing to flush the database {name!r}: benchmarks delete all of its data. Point '
+            f'DATABASES[{using!r}] at a database with {BENCHMARK_DATABASE_MARKER!r} in its name, '
+            f'or pass allow_flush=True (--yes-flush) to flush it anyway.'
+        )
+
+
+def run_benchmarks(module, sizes=DEFAULT_SIZES, arguments=None, app_label='main_app', method='bulk',
+                   repeat=3, output=None, allow_flush=False):
+    """
+    Seeds the app at every size and benchmarks each public function of a caller module.
+
+    Before every size the database is flushed and every model of the app is populated with
+    that many records through populate_db.populate_app_with_data(), which leaves out the app's derived
+    and bookkeeping models and rebuilds the derived data afterwards. Since flushing deletes all data,
+    the default database must be a dedicated benchmark database (see check_benchmark_database()).
+
+    Parameters:
+        module: The imported caller module.
+        sizes (iterable): The number of records per model for each round.
+        arguments (dict): {function name: (args, kwargs)} for functions with required parameters.
+            Functions with required parameters and no entry here are skipped.
+        app_label (str): The app to seed.
+        method (str): The populate_db loader, 'bulk', 'copy' or 'parallel'.
+        repeat (int): The number of timed runs per function.
+        output (str): Optional path of the JSON file the results are written to.
+        allow_flush (bool): Whether to flush the database even if its name does not mark it as
+            a benchmark database.
+
+    Returns:
+        dict: The results, in the same shape as the JSON file.
+
+    Raises:
+        ImproperlyConfigured: If the database is not a benchmark database and allow_flush is False.
+    """
+    if not allow_flush:
+        check_benchmark_database()
+
+    if arguments is None:
+        arguments = {}
+
+    functions = public_functions(module)
+    results = []
+
+    for size in sizes:
+        call_command('flush', interactive=False, verbosity=0)
+
+        start = time.perf_counter()
+        populate_app_with_data(app_label, default_count=size, method=method)
+        seed_time = time.perf_counter() - start
+
+        for name, function in functions.items():
+            if name in arguments:
+                args, kwargs = arguments[name]
+            elif _has_required_parameters(function):
+                continue
+            else:
+                args, kwargs = (), {}
+
+            result = benchmark_function(function, args, kwargs, repeat)
+            result.update(size=size, function=name, seed_time=seed_time)
+            results.append(result)
+
+            print(
+                f"{size:>9} {name:<45} "
+                f"{result['wall_time']['median'] * 1000:>10.2f} ms "
+                f"{result['queries']:>5} queries "
+                f"{result['rows']:>8} rows "
+                f"{result['peak_memory'] / 1024:>10.1f} KiB"
+            )
+
+    report = {
+        'commit': _current_commit(),
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'module': module.__name__,
+        'method': method,
+        'results': results,
+    }
+
+    if output:
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    return report
+
+
+def compare_results(baseline, current, threshold=0.2):
+    """
+    Compares two benchmark reports and returns the regressions.
+
+    A function regresses when its median wall time grew by more than threshold (0.2 = 20 %)
+    or when it runs more queries than before.
+
+    Parameters:
+        baseline (dict | str): The older report, or the path of its JSON file.
+        current (dict | str): The newer report, or the path of its JSON file.
+        threshold (float): The allowed relative slowdown.
+
+    Returns:
+        list: One dict per regression with size, function and the old and new measurements.
+    """
+    baseline, current = _load_report(baseline), _load_report(current)
+    previous = {(result['size'], result['function']): result for result in baseline['results']}
+
+    regressions = []
+    for result in current['results']:
+        old = previous.get((result['size'], result['function']))
+        if old is None:
+            continue
+
+        old_time, new_time = old['wall_time']['median'], result['wall_time']['median']
+        if new_time > old_time * (1 + threshold) or result['queries'] > old['queries']:
+            regressions.append({
+                'size': result['size'],
+                'function': result['function'],
+                'wall_time': (old_time, new_time),
+                'queries': (old['queries'], result['queries']),
+            })
+
+    return regressions
+
+
+def _load_report(report):
+    if isinstance(report, str):
+        with open(report) as file:
+            return json.load(file)
+    return report
+
+
+def _current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
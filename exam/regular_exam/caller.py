@@ -6,8 +6,11 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
 django.setup()
 
 # Import the models
-from main_app.models import Astronaut, Spacecraft, Mission
-from django.db.models import Count, Avg, Sum, Q, F, Case, When, Value, FloatField
+from main_app.models import Astronaut, Spacecraft, Mission, SpacecraftUsage
+from django.db.models import Q
+from main_app.cache import cached_report
+
+Crew = Mission.astronauts.through
 
 
 # Create queries within functions
@@ -47,6 +50,47 @@ def get_astronauts(search_string: str = None) -> str:
     return '\n'.join(result)
 
 
+def get_astronauts_page(search_string: str = None, cursor: str = None, per_page: int = 20) -> str:
+    """
+    This function retrieves one page of the astronauts matched by get_astronauts, ordered by name.
+    Pages are fetched by seeking past the previous page instead of using an offset, so every page
+    takes the same time to load.
+
+    Parameters:
+        search_string (str): The search string to filter astronauts. If None, all astronauts are returned.
+        cursor (str): The cursor printed at the end of the previous page. If None, the first page is returned.
+        per_page (int): The number of astronauts on a page.
+
+    Returns:
+        str: A string containing the details of the astronauts on the page, followed by the cursor of the
+             next page if there is one. If no astronauts are found, an empty string is returned.
+    """
+    astronauts = Astronaut.objects.all()
+
+    if search_string is not None:
+        astronauts = astronauts.filter(
+            Q(name__icontains=search_string) |
+            Q(phone_number__icontains=search_string)
+        )
+
+    page = astronauts.page_by_name(cursor, per_page)
+
+    result = []
+    for astronaut in page:
+        status = "Active" if astronaut.is_active else "Inactive"
+        result.append(
+            f'Astronaut: {astronaut.name}, '
+            f'phone number: {astronaut.phone_number}, '
+            f'status: {status}'
+        )
+
+    if page.has_next():
+        result.append(f'Next page: {page.next_cursor}')
+
+    return '\n'.join(result)
+
+
+@cached_report(Astronaut, Crew)
 def get_top_astronaut() -> str:
     """
     This function retrieves the astronaut with the highest number of missions.
@@ -60,26 +104,21 @@ def get_top_astronaut() -> str:
              is returned.
     """
     top_astronaut = (
-        Astronaut.objects.
-        annotate(
-            num_of_missions=Count('missions')
-        ).
-        order_by(
-            '-num_of_missions',
-            'phone_number'
-        ).
-        first()
+        Astronaut.objects
+        .get_astronauts_by_missions_count()
+        .first()
     )
 
-    if not top_astronaut or top_astronaut.num_of_missions == 0:
+    if not top_astronaut or top_astronaut.missions_count == 0:
         return "No data."
 
     return (
         f"Top Astronaut: {top_astronaut.name} "
-        f"with {top_astronaut.num_of_missions} missions."
+        f"with {top_astronaut.missions_count} missions."
     )
 
 
+@cached_report(Astronaut, Mission)
 def get_top_commander() -> str:
     """
     This function retrieves the astronaut with the highest number of commanded missions.
@@ -95,25 +134,20 @@ def get_top_commander() -> str:
     """
     top_commander = (
         Astronaut.objects
-        .annotate(
-            num_of_commanded_missions=Count('commanded_missions')
-        )
-        .order_by(
-            '-num_of_commanded_missions',
-            'phone_number'
-        )
+        .get_astronauts_by_commanded_missions_count()
         .first()
     )
 
-    if not top_commander or top_commander.num_of_commanded_missions == 0:
+    if not top_commander or top_commander.commanded_missions_count == 0:
         return "No data."
 
     return (
         f"Top Commander: {top_commander.name} "
-        f"with {top_commander.num_of_commanded_missions} commanded missions."
+        f"with {top_commander.commanded_missions_count} commanded missions."
     )
 
 
+@cached_report(Mission, Astronaut, Spacecraft, Crew)
 def get_last_completed_mission() -> str:
     """
     Retrieves the last completed mission, including details about the commander,
@@ -128,6 +162,7 @@ def get_last_completed_mission() -> str:
         Mission.objects
         .filter(status='Completed')
         .order_by('-launch_date')
+        .with_summary()
         .first()
     )
 
@@ -135,20 +170,17 @@ def get_last_completed_mission() -> str:
         return "No data."
 
     commander_name = last_completed_mission.commander.name if last_completed_mission.commander else "TBA"
-    astronauts = last_completed_mission.astronauts.order_by('name')
-    astronaut_names = ", ".join(astronaut.name for astronaut in astronauts)
-    spacecraft_name = last_completed_mission.spacecraft.name
-    total_spacewalks = astronauts.aggregate(total_spacewalks=Sum('spacewalks'))['total_spacewalks'] or 0
 
     return (
         f"The last completed mission is: {last_completed_mission.name}. "
         f"Commander: {commander_name}. "
-        f"Astronauts: {astronaut_names}. "
-        f"Spacecraft: {spacecraft_name}. "
-        f"Total spacewalks: {total_spacewalks}."
+        f"Astronauts: {last_completed_mission.astronaut_names}. "
+        f"Spacecraft: {last_completed_mission.spacecraft.name}. "
+        f"Total spacewalks: {last_completed_mission.total_spacewalks}."
     )
 
 
+@cached_report(SpacecraftUsage, Spacecraft, Mission, Crew)
 def get_most_used_spacecraft() -> str:
     """
     Retrieves the most used spacecraft in the database based on the number of missions it has been involved in.
@@ -159,28 +191,20 @@ def get_most_used_spacecraft() -> str:
         str: A string containing the details of the most used spacecraft.
              If no data is available, "No data." is returned.
     """
-    most_used_spacecraft = (
-        Spacecraft.objects
-        .annotate(num_missions=Count('missions'))
-        .order_by('-num_missions', 'name')
+    most_used = (
+        SpacecraftUsage.objects
+        .get_spacecrafts_by_mission_count()
         .first()
     )
 
-    if not most_used_spacecraft or most_used_spacecraft.num_missions == 0:
+    if not most_used or most_used.mission_count == 0:
         return "No data."
 
-    num_astronauts = (
-        Astronaut.objects
-        .filter(missions__spacecraft=most_used_spacecraft)
-        .distinct()
-        .count()
-    )
-
     return (
-        f"The most used spacecraft is: {most_used_spacecraft.name}, "
-        f"manufactured by {most_used_spacecraft.manufacturer}, "
-        f"used in {most_used_spacecraft.num_missions} missions, "
-        f"astronauts on missions: {num_astronauts}."
+        f"The most used spacecraft is: {most_used.spacecraft.name}, "
+        f"manufactured by {most_used.spacecraft.manufacturer}, "
+        f"used in {most_used.mission_count} missions, "
+        f"astronauts on missions: {most_used.astronaut_count}."
     )
 
 
@@ -193,25 +217,14 @@ def decrease_spacecrafts_weight() -> str:
         str: A string indicating the number of spacecrafts whose weights have been decreased and the new average weight
              of all spacecrafts. If no spacecrafts meet the criteria, a message indicating no changes is returned.
     """
-    spacecrafts_to_update = (
-        Spacecraft.objects
-        .filter(missions__status='Planned', weight__gte=200.0)
-        .distinct()
+    updated_count, avg_weight = Spacecraft.objects.adjust_weight(
+        -200.0,
+        where=Q(missions__status='Planned', weight__gte=200.0),
     )
 
-    if not spacecrafts_to_update.exists():
+    if not updated_count:
         return "No changes in weight."
 
-    updated_count = spacecrafts_to_update.update(
-        weight=Case(
-            When(weight__gte=200.0, then=F('weight') - 200.0),
-            default=Value(0.0),
-            output_field=FloatField()
-        )
-    )
-
-    avg_weight = Spacecraft.objects.aggregate(avg_weight=Avg('weight'))['avg_weight']
-
     return (
         f"The weight of {updated_count} spacecrafts has been decreased. "
         f"The new average weight of all spacecrafts is {avg_weight:.1f}kg"
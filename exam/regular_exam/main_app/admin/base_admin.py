@@ -1,4 +1,134 @@
+import hashlib
+import json
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections, models
+from django.db.models.functions import Substr
+from django.utils.functional import cached_property
+
+from main_app.pagination import key_fields, key_values, seek_filter
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that estimates the number of objects on PostgreSQL instead of running COUNT(*).
+
+    Unfiltered querysets use the row estimate that ANALYZE keeps in pg_class.reltuples, filtered ones
+    use the planner's row estimate from EXPLAIN. Estimates below exact_count_threshold, missing
+    statistics and other databases fall back to an exact count.
+
+    Attributes:
+        exact_count_threshold: The estimated count under which the objects are counted exactly.
+    """
+
+    exact_count_threshold = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+
+        if connection.vendor != 'postgresql':
+            return super().count
+
+        if queryset.query.where:
+            plan = json.loads(queryset.explain(format='json'))
+            estimate = plan[0]['Plan']['Plan Rows']
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                    [connection.ops.quote_name(queryset.model._meta.db_table)],
+                )
+                row = cursor.fetchone()
+            estimate = row[0] if row else -1
+
+        if estimate < self.exact_count_threshold:
+            return super().count
+
+        return int(estimate)
+
+
+class SeekingPaginator(EstimatedCountPaginator):
+    """
+    EstimatedCountPaginator that fetches a page by seeking past the last row of the previous page
+    instead of using OFFSET, so paging forward costs the same on page 10,000 as on page 1.
+
+    The changelist links pages by number, so the keys of the last row of every page served are kept
+    in the cache for boundary_timeout seconds. A page whose predecessor was not served recently
+    (e.g. when jumping straight to the last page) falls back to OFFSET, as does an ordering
+    that is not made of concrete fields.
+
+    Attributes:
+        boundary_timeout: The number of seconds page boundaries are kept.
+    """
+
+    boundary_timeout = 300
+
+    def page(self, number):
+        number = self.validate_number(number)
+        queryset = self.object_list
+        # The changelist may repeat a key, e.g. ('name', 'name', '-pk'); only its first occurrence counts
+        ordering, seen = [], set()
+        for name in queryset.query.order_by:
+            key = name.lstrip('-') if isinstance(name, str) else name
+            if key not in seen:
+                seen.add(key)
+                ordering.append(name)
+
+        fields = key_fields(queryset.model, ordering) if ordering else None
+
+        boundary = cache.get(self._boundary_key(number - 1)) if fields and number > 1 else None
+
+        # NULL keys cannot be compared, so pages after them are fetched with OFFSET
+        if boundary is not None and None not in boundary:
+            objects = list(queryset.filter(seek_filter(ordering, boundary))[:self.per_page])
+        else:
+            bottom = (number - 1) * self.per_page
+            objects = list(queryset[bottom:bottom + self.per_page])
+
+        if fields and objects:
+            cache.set(self._boundary_key(number), key_values(objects[-1], fields), self.boundary_timeout)
+
+        return self._get_page(objects, number, self)
+
+    @cached_property
+    def _query_key(self):
+        return hashlib.md5(f'{self.object_list.query}:{self.per_page}'.encode()).hexdigest()
+
+    def _boundary_key(self, number):
+        return f'admin-page-boundary:{self._query_key}:{number}'
+
+
+class LargeTableChangeList(ChangeList):
+    """
+    ChangeList that loads only a prefix of every TextField in list_display.
+
+    The full values are deferred and replaced by an annotation holding their first
+    large_table_text_length + 1 characters, cut server-side with Substr.
+    """
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        text_fields = self.model_admin.get_truncated_text_fields()
+
+        if not text_fields:
+            return queryset
+
+        length = self.model_admin.large_table_text_length + 1
+
+        return (
+            queryset
+            .defer(*text_fields)
+            .annotate(**{
+                f'{name}_preview': Substr(name, 1, length)
+                for name in text_fields
+            })
+        )
 
 
 class BaseAdmin(admin.ModelAdmin):
@@ -11,9 +141,15 @@ class BaseAdmin(admin.ModelAdmin):
     Attributes:
         readonly_fields: A list of field names that should be displayed as read-only in the admin interface.
         ordering: A list of field names that determines the default ordering of objects in the admin interface.
+        large_table_mode: Whether the changelist is tuned for tables with millions of rows:
+            - counts are estimated and the unfiltered total is not counted,
+            - paging forward seeks past the previous page instead of using OFFSET (see SeekingPaginator),
+            - TextFields in list_display are truncated in the database to large_table_text_length characters,
+            - list_select_related is derived from the relations in list_display, unless it is set explicitly.
+        large_table_text_length: The number of characters shown of TextFields in large_table_mode.
 
     Methods:
-        None
+        get_truncated_text_fields: Returns the names of the TextFields in list_display truncated in large_table_mode.
     """
 
     readonly_fields = [
@@ -22,4 +158,85 @@ class BaseAdmin(admin.ModelAdmin):
 
     ordering = [
         'name',
-    ]
\ No newline at end of file
+    ]
+
+    large_table_mode = False
+
+    large_table_text_length = 100
+
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+
+        if self.large_table_mode:
+            self.show_full_result_count = False
+            self.paginator = SeekingPaginator
+
+            if self.list_select_related is False:
+                self.list_select_related = self.get_related_fields_in_list_display()
+
+    def get_related_fields_in_list_display(self):
+        """
+        Returns the foreign keys shown in list_display, directly or through a 'relation__field' lookup.
+        """
+        related = []
+
+        for name in self.list_display:
+            if not isinstance(name, str):
+                continue
+            relation = name.split('__')[0]
+            try:
+                field = self.model._meta.get_field(relation)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_one or field.one_to_one:
+                if relation not in related:
+                    related.append(relation)
+
+        return related
+
+    def get_truncated_text_fields(self):
+        if not self.large_table_mode:
+            return []
+
+        text_fields = []
+
+        for name in self.list_display:
+            try:
+                field = self.model._meta.get_field(name) if isinstance(name, str) else None
+            except FieldDoesNotExist:
+                continue
+            if isinstance(field, models.TextField):
+                text_fields.append(name)
+
+        return text_fields
+
+    def get_changelist(self, request, **kwargs):
+        if self.large_table_mode:
+            return LargeTableChangeList
+        return super().get_changelist(request, **kwargs)
+
+    def get_list_display(self, request):
+        list_display = super().get_list_display(request)
+        text_fields = self.get_truncated_text_fields()
+
+        if not text_fields:
+            return list_display
+
+        return [
+            self._truncated_text(name) if name in text_fields else name
+            for name in list_display
+        ]
+
+    def _truncated_text(self, name):
+        length = self.large_table_text_length
+        field = self.model._meta.get_field(name)
+
+        @admin.display(description=field.verbose_name, ordering=name)
+        def display(obj):
+            preview = getattr(obj, f'{name}_preview', None)
+            if preview is None:
+                return self.get_empty_value_display()
+            return preview[:length] + '…' if len(preview) > length else preview
+
+        display.__name__ = name
+        return display
@@ -17,8 +17,17 @@ class MissionAdmin(BaseAdmin):
         - list_display: A list of field names to display in the list view of the Mission model.
         - list_filter: A list of field names to use as filters in the list view of the Mission model.
         - search_fields: A list of field names to use as search fields in the list view of the Mission model.
+        - large_table_mode: Enabled, since the mission table is expected to hold millions of rows.
+        - ordering: Latest launch first, matching the (launch_date, id) index the paginator seeks on.
     """
 
+    large_table_mode = True
+
+    ordering = [
+        '-launch_date',
+        '-id',
+    ]
+
     list_display = [
         'name',
         'status',
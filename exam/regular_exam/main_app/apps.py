@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class MainAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main_app'
+
+    # Models populate_db does not seed: statistics derived from the spacecraft and missions, and change feed bookkeeping
+    unseeded_models = ['SpacecraftUsage', 'SpacecraftWeightStats', 'Tombstone', 'ChangeFeedWatermark']
+
+    def ready(self):
+        # Connect the signal handlers
+        from main_app import signals
+
+    def rebuild_derived_data(self):
+        """
+        Recomputes the mission counters, spacecraft usage statistics and spacecraft weight total, e.g. after
+        populate_db seeded the app with bulk inserts that bypass the handlers in main_app.signals.
+        """
+        self.get_model('Astronaut').objects.rebuild_mission_counters()
+        self.get_model('SpacecraftUsage').objects.rebuild()
+        self.get_model('SpacecraftWeightStats').objects.rebuild()
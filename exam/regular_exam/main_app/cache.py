@@ -0,0 +1,127 @@
+import functools
+import hashlib
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Hit and miss counts of every cached report, keyed by report name
+hits = Counter()
+misses = Counter()
+
+_MISSING = object()
+
+
+def version_key(model):
+    return f'report-version:{model._meta.label_lower}'
+
+
+def invalidate(*models):
+    """
+    Invalidates every cached report that reads any of the given models.
+
+    Saves, deletes and many-to-many changes of main_app models call this through the handlers
+    in main_app.signals. Writes that bypass signals (QuerySet.update, bulk_create, raw SQL)
+    must call it themselves.
+
+    Each model has a version number stored in the cache and every report key contains the versions
+    of the models it reads, so bumping a version makes the old entries unreachable. The versions
+    are bumped immediately and again when the current transaction commits, so a report computed
+    by another process before the commit is not served afterwards.
+
+    Parameters:
+        models: The model classes whose data changed.
+    """
+    keys = [version_key(model) for model in models]
+
+    _bump_versions(keys)
+    transaction.on_commit(functools.partial(_bump_versions, keys))
+
+
+def _bump_versions(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Missing or evicted version; a fresh clock-based value cannot match any older report key
+            cache.set(key, time.time_ns(), None)
+
+
+def _versions(models):
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def cached_report(*models):
+    """
+    Caches the result of a read-only report until any of the models it reads changes.
+    Results computed inside a transaction are returned but not stored.
+
+    Parameters:
+        models: The model classes (including auto-created through models) the report reads.
+
+    Returns:
+        A decorator for the report function.
+
+    Example:
+        @cached_report(Astronaut, Mission.astronauts.through)
+        def get_top_astronaut() -> str:
+            ...
+    """
+    def decorator(report):
+        name = report.__qualname__
+
+        @functools.wraps(report)
+        def wrapper(*args, **kwargs):
+            arguments = hashlib.md5(repr((args, sorted(kwargs.items()))).encode()).hexdigest()
+            versions = '.'.join(str(version) for version in _versions(models))
+            key = f'report:{report.__module__}.{name}:{arguments}:{versions}'
+
+            result = cache.get(key, _MISSING)
+            if result is not _MISSING:
+                hits[name] += 1
+                return result
+
+            misses[name] += 1
+            result = report(*args, **kwargs)
+
+            # Inside a transaction the result may include changes that are later rolled back
+            if not transaction.get_connection().in_atomic_block:
+                cache.set(key, result)
+
+            return result
+
+        wrapper.models = models
+        return wrapper
+
+    return decorator
+
+
+def cache_stats():
+    """
+    Returns the hit and miss counts of the cached reports.
+
+    Returns:
+        dict: {'hits': int, 'misses': int, 'reports': {report name: {'hits': int, 'misses': int}}}
+    """
+    return {
+        'hits': sum(hits.values()),
+        'misses': sum(misses.values()),
+        'reports': {
+            name: {'hits': hits[name], 'misses': misses[name]}
+            for name in sorted(hits.keys() | misses.keys())
+        },
+    }
+
+
+def reset_cache_stats():
+    hits.clear()
+    misses.clear()
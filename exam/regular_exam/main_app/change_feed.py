@@ -0,0 +1,147 @@
+from datetime import timedelta
+
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from main_app.models import ChangeFeedWatermark, Tombstone
+from main_app.pagination import seek_filter
+
+
+class ChangeBatch:
+    """
+    A batch of changes read from a ChangeFeed.
+
+    Attributes:
+        changed (list): The rows created or updated since the previous batch, ordered by (updated_at, id).
+        deleted (list): The primary keys of the rows deleted since the previous batch.
+        position (tuple): The watermark to save once the batch has been processed.
+    """
+
+    def __init__(self, changed, deleted, position):
+        self.changed = changed
+        self.deleted = deleted
+        self.position = position
+
+    def __bool__(self):
+        return bool(self.changed or self.deleted)
+
+
+class ChangeFeed:
+    """
+    Reads the rows of a TimeStampedMixin model that changed since a consumer's persisted watermark.
+
+    Changed rows are read with keyset batches on the (updated_at, id) index and deletions from the
+    Tombstone table on (model, deleted_at, id). The watermark only moves when a batch is acknowledged,
+    so a consumer that fails halfway reads the unacknowledged batch again.
+
+    updated_at is set before a transaction commits, so a row may become visible after rows with later
+    timestamps. Only changes older than lag are read, which leaves running transactions that much time
+    to commit before the watermark passes them.
+
+    Attributes:
+        consumer (str): The name the watermark is stored under.
+        model: The model class to read.
+        batch_size (int): The maximum number of changed rows and of deleted rows per batch.
+        lag (timedelta): How old a change must be to be read.
+
+    Example:
+        feed = ChangeFeed('warehouse-sync', Mission)
+        for batch in feed:
+            export(batch.changed, batch.deleted)
+    """
+
+    def __init__(self, consumer, model, batch_size=1000, lag=timedelta(seconds=60)):
+        self.consumer = consumer
+        self.model = model
+        self.batch_size = batch_size
+        self.lag = lag
+
+    @property
+    def label(self):
+        return self.model._meta.label_lower
+
+    def watermark(self):
+        watermark, _ = ChangeFeedWatermark.objects.get_or_create(consumer=self.consumer, model=self.label)
+        return watermark
+
+    def next_batch(self):
+        """
+        Returns the changes following the consumer's watermark, without moving it.
+
+        Returns:
+            ChangeBatch: The changes, which is empty (falsy) when the consumer is up to date.
+        """
+        watermark = self.watermark()
+        until = timezone.now() - self.lag
+
+        changed = self.model._default_manager.filter(updated_at__lte=until).order_by('updated_at', 'id')
+        if watermark.updated_at is not None:
+            changed = changed.filter(
+                seek_filter(('updated_at', 'id'), [watermark.updated_at, watermark.object_id])
+            )
+        changed = list(changed[:self.batch_size])
+
+        tombstones = Tombstone.objects.filter(model=self.label, deleted_at__lte=until).order_by('deleted_at', 'id')
+        if watermark.deleted_at is not None:
+            tombstones = tombstones.filter(
+                seek_filter(('deleted_at', 'id'), [watermark.deleted_at, watermark.tombstone_id])
+            )
+        tombstones = list(tombstones.values_list('object_id', 'deleted_at', 'id')[:self.batch_size])
+
+        position = (
+            (changed[-1].updated_at, changed[-1].pk) if changed else (watermark.updated_at, watermark.object_id),
+            tombstones[-1][1:] if tombstones else (watermark.deleted_at, watermark.tombstone_id),
+        )
+
+        return ChangeBatch(changed, [object_id for object_id, _, _ in tombstones], position)
+
+    def acknowledge(self, batch):
+        """
+        Moves the consumer's watermark past a batch returned by next_batch().
+        """
+        (updated_at, object_id), (deleted_at, tombstone_id) = batch.position
+
+        ChangeFeedWatermark.objects.filter(consumer=self.consumer, model=self.label).update(
+            updated_at=updated_at,
+            object_id=object_id,
+            deleted_at=deleted_at,
+            tombstone_id=tombstone_id,
+        )
+
+    def __iter__(self):
+        # Every batch is acknowledged when the next one is requested, i.e. after the loop body processed it
+        while batch := self.next_batch():
+            yield batch
+            self.acknowledge(batch)
+
+    def reset(self):
+        """
+        Makes the consumer read every row again from the beginning.
+        """
+        ChangeFeedWatermark.objects.filter(consumer=self.consumer, model=self.label).delete()
+
+
+def purge_tombstones(model):
+    """
+    Deletes the tombstones of a model that every consumer of its change feed has read.
+
+    Parameters:
+        model: The model class whose tombstones to purge.
+
+    Returns:
+        int: The number of tombstones deleted.
+    """
+    label = model._meta.label_lower
+
+    watermarks = ChangeFeedWatermark.objects.filter(model=label).aggregate(
+        consumers=Count('pk'),
+        unread=Count('pk', filter=Q(deleted_at__isnull=True)),
+        oldest=Min('deleted_at'),
+    )
+
+    # Kept while there are no consumers or one of them has not read any tombstone yet
+    if not watermarks['consumers'] or watermarks['unread']:
+        return 0
+
+    deleted, _ = Tombstone.objects.filter(model=label, deleted_at__lt=watermarks['oldest']).delete()
+    return deleted
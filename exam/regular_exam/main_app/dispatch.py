@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent once by MissionQuerySet.assign_crews() after it links astronauts to missions, instead of an
+# m2m_changed signal per mission. Receivers get sender=Mission and links={mission id: [astronaut ids]},
+# holding only the links that were created.
+crews_assigned = Signal()
@@ -0,0 +1,67 @@
+import math
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main_app.models import Astronaut, SpacecraftUsage, SpacecraftWeightStats, Spacecraft
+
+
+class Command(BaseCommand):
+    help = (
+        'Verifies the denormalized mission counters of every astronaut, the usage statistics of every '
+        'spacecraft and the spacecraft weight total, and repairs the ones that drifted.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report drifted counters and exit with a non-zero status if there are any.',
+        )
+
+    def handle(self, *args, **options):
+        drifted = Astronaut.objects.with_drifted_mission_counts().order_by('pk')
+        drifted_usage = SpacecraftUsage.objects.with_drifted_counts().order_by('pk')
+        missing_usage = Spacecraft.objects.filter(usage__isnull=True).order_by('pk')
+        weight_stats = SpacecraftWeightStats.objects.first()
+        actual_weight_stats = SpacecraftWeightStats.objects.actual()
+        # The total is a running float sum, so it is compared with a tolerance for rounding errors
+        drifted_weight_stats = weight_stats is None or not (
+            weight_stats.spacecraft_count == actual_weight_stats['spacecraft_count']
+            and math.isclose(weight_stats.total_weight, actual_weight_stats['total_weight'], abs_tol=1e-6)
+        )
+
+        if options['check']:
+            for astronaut in drifted:
+                self.stdout.write(
+                    f'Astronaut {astronaut.pk}: '
+                    f'missions {astronaut.missions_count} != {astronaut.actual_missions_count}, '
+                    f'commanded {astronaut.commanded_missions_count} != {astronaut.actual_commanded_missions_count}'
+                )
+            for usage in drifted_usage:
+                self.stdout.write(
+                    f'Spacecraft {usage.pk}: '
+                    f'missions {usage.mission_count} != {usage.actual_mission_count}, '
+                    f'astronauts {usage.astronaut_count} != {usage.actual_astronaut_count}'
+                )
+            for spacecraft_id in missing_usage.values_list('pk', flat=True):
+                self.stdout.write(f'Spacecraft {spacecraft_id}: no usage statistics')
+            if weight_stats is None:
+                self.stdout.write('Spacecraft weight total: no statistics')
+            elif drifted_weight_stats:
+                self.stdout.write(
+                    f'Spacecraft weight total: '
+                    f'weight {weight_stats.total_weight} != {actual_weight_stats["total_weight"]}, '
+                    f'spacecraft {weight_stats.spacecraft_count} != {actual_weight_stats["spacecraft_count"]}'
+                )
+            if drifted.exists() or drifted_usage.exists() or missing_usage.exists() or drifted_weight_stats:
+                raise CommandError('Some counters are out of date, run rebuild_counters to repair them.')
+            self.stdout.write(self.style.SUCCESS('All counters are correct.'))
+            return
+
+        fixed = Astronaut.objects.rebuild_mission_counters()
+        fixed_usage = SpacecraftUsage.objects.rebuild()
+        SpacecraftWeightStats.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the counters of {fixed} astronauts, the usage statistics of {fixed_usage} spacecraft '
+            f'and the spacecraft weight total.'
+        ))
@@ -1,15 +1,496 @@
-from django.db import models
-from django.db.models import Count
+from django.contrib.postgres.aggregates import ArrayAgg, StringAgg
+from django.core.exceptions import ValidationError
+from django.db import models, connections, transaction
+from django.db.models import Count, Q, F, Sum, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
+from main_app.cache import invalidate
+from main_app.dispatch import crews_assigned
+from main_app.pagination import KeysetPaginationMixin
 
-class AstronautManager(models.Manager):
+
+class AstronautQuerySet(KeysetPaginationMixin, models.QuerySet):
+    def page_by_name(self, cursor=None, per_page=25):
+        """
+        Returns a page of astronauts ordered by name, seeking on the (name, id) index.
+        """
+        return self.keyset_page(('name', 'id'), cursor, per_page)
+
+
+class AstronautManager(models.Manager.from_queryset(AstronautQuerySet)):
     def get_astronauts_by_missions_count(self):
         return (
-            self.annotate(
-                missions_count=Count('missions')
-            )
-            .order_by(
+            self.order_by(
                 '-missions_count',
                 'phone_number'
             )
         )
+
+    def get_astronauts_by_commanded_missions_count(self):
+        return (
+            self.order_by(
+                '-commanded_missions_count',
+                'phone_number'
+            )
+        )
+
+    def with_actual_mission_counts(self):
+        """
+        Annotates every astronaut with actual_missions_count and actual_commanded_missions_count,
+        counted from the missions themselves rather than read from the stored counters.
+        """
+        crew = (
+            self.model.missions.through.objects
+            .filter(astronaut_id=OuterRef('pk'))
+            .order_by()
+            .values('astronaut_id')
+            .annotate(total=Count('*'))
+            .values('total')
+        )
+        commanded = (
+            self.model.commanded_missions.field.model.objects
+            .filter(commander_id=OuterRef('pk'))
+            .order_by()
+            .values('commander_id')
+            .annotate(total=Count('*'))
+            .values('total')
+        )
+
+        return self.annotate(
+            actual_missions_count=Coalesce(Subquery(crew), 0),
+            actual_commanded_missions_count=Coalesce(Subquery(commanded), 0),
+        )
+
+    def with_drifted_mission_counts(self):
+        """
+        Returns the astronauts whose stored mission counters differ from the actual counts.
+        """
+        return (
+            self.with_actual_mission_counts()
+            .exclude(
+                missions_count=F('actual_missions_count'),
+                commanded_missions_count=F('actual_commanded_missions_count'),
+            )
+        )
+
+    def rebuild_mission_counters(self):
+        """
+        Recomputes missions_count and commanded_missions_count of every drifted astronaut in a single UPDATE.
+        The UPDATE bypasses signals, so the cached reports reading astronauts are invalidated here.
+
+        Returns:
+            int: The number of astronauts that were corrected.
+        """
+        actual = self.with_actual_mission_counts().filter(pk=OuterRef('pk'))
+
+        fixed = (
+            self.filter(pk__in=self.with_drifted_mission_counts().values('pk'))
+            .update(
+                missions_count=Subquery(actual.values('actual_missions_count')),
+                commanded_missions_count=Subquery(actual.values('actual_commanded_missions_count')),
+                updated_at=timezone.now(),
+            )
+        )
+
+        if fixed:
+            invalidate(self.model)
+
+        return fixed
+
+    def search(self, search_string):
+        """
+        Returns the astronauts whose name contains search_string (case-insensitive)
+        or whose phone number starts with it.
+
+        Phone numbers contain only digits, so they are matched only for all-digit search strings,
+        using a B-tree prefix scan. Names are matched through the trigram index on UPPER(name).
+        """
+        query = Q(name__icontains=search_string)
+
+        if search_string.isdigit():
+            query |= Q(phone_number__startswith=search_string)
+
+        return self.filter(query)
+
+
+class SpacecraftQuerySet(KeysetPaginationMixin, models.QuerySet):
+    def adjust_weight(self, delta, where=None):
+        """
+        Adds delta to the weight of every spacecraft in the queryset that matches where, without going below 0.
+
+        The rows are updated with a single UPDATE ... FROM ... RETURNING statement, which also adds their
+        changes to the weight total in SpacecraftWeightStats and derives the new average weight of all
+        spacecraft from the total and count it returns, so the spacecraft table is not aggregated.
+
+        Parameters:
+            delta (float): The amount to add to the weight. Negative values decrease it.
+            where (Q): Additional conditions the spacecraft must match. Conditions spanning
+                multi-valued relations (e.g. missions__status) update every spacecraft only once.
+
+        Returns:
+            tuple: The number of updated spacecraft and the new average weight of all spacecraft,
+                   which is None if there are none.
+        """
+        queryset = self.filter(where) if where is not None else self
+        matching = queryset.order_by().values('pk', 'weight').distinct()
+        stats_model = self.model._meta.apps.get_model(self.model._meta.app_label, 'SpacecraftWeightStats')
+
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        table = quote(opts.db_table)
+        pk = quote(opts.pk.column)
+        weight = quote(opts.get_field('weight').column)
+        updated_at = quote(opts.get_field('updated_at').column)
+        stats_table = quote(stats_model._meta.db_table)
+        total_weight = quote(stats_model._meta.get_field('total_weight').column)
+        spacecraft_count = quote(stats_model._meta.get_field('spacecraft_count').column)
+
+        matching_sql, matching_params = matching.query.sql_with_params()
+
+        sql = f"""
+            WITH updated AS (
+                UPDATE {table} AS spacecraft
+                SET {weight} = GREATEST(spacecraft.{weight} + %s, 0), {updated_at} = %s
+                FROM ({matching_sql}) AS matching (id, weight)
+                WHERE spacecraft.{pk} = matching.id
+                RETURNING spacecraft.{weight} - matching.weight AS change
+            ), stats AS (
+                UPDATE {stats_table}
+                SET {total_weight} = {total_weight} + COALESCE((SELECT SUM(change) FROM updated), 0)
+                RETURNING {total_weight} AS total_weight, {spacecraft_count} AS spacecraft_count
+            )
+            SELECT
+                (SELECT COUNT(*) FROM updated),
+                (SELECT total_weight / NULLIF(spacecraft_count, 0) FROM stats),
+                EXISTS (SELECT FROM stats)
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [delta, timezone.now(), *matching_params])
+            updated_count, avg_weight, has_stats = cursor.fetchone()
+
+        if not has_stats:
+            # The row is created by the migrations; if it was removed, recompute it from the updated table
+            stats = stats_model.objects.db_manager(self.db).rebuild()
+            avg_weight = stats.total_weight / stats.spacecraft_count if stats.spacecraft_count else None
+
+        if updated_count:
+            invalidate(self.model)
+
+        return updated_count, avg_weight
+
+
+class SpacecraftWeightStatsManager(models.Manager):
+    def actual(self):
+        """
+        Returns the weight total and count of all spacecraft, aggregated from the spacecraft table
+        rather than read from the stored row.
+
+        Returns:
+            dict: {'total_weight': float, 'spacecraft_count': int}.
+        """
+        spacecraft_model = self.model._meta.apps.get_model(self.model._meta.app_label, 'Spacecraft')
+
+        return spacecraft_model.objects.db_manager(self.db).aggregate(
+            total_weight=Coalesce(Sum('weight'), 0.0),
+            spacecraft_count=Count('pk'),
+        )
+
+    def change(self, weight_delta, count_delta):
+        """
+        Adds the given deltas to the stored row, recomputing it if it does not exist.
+
+        Parameters:
+            weight_delta (float): The amount to add to the weight total.
+            count_delta (int): The number of spacecraft added, negative for removed ones.
+        """
+        updated = self.update(
+            total_weight=F('total_weight') + weight_delta,
+            spacecraft_count=F('spacecraft_count') + count_delta,
+        )
+
+        if not updated:
+            self.rebuild()
+
+    def rebuild(self):
+        """
+        Recomputes the stored row from the spacecraft table, creating it if it does not exist.
+
+        The row is locked before the table is aggregated, so concurrent spacecraft changes wait
+        to add their deltas until the recomputed row is stored.
+
+        Returns:
+            SpacecraftWeightStats: The recomputed row.
+        """
+        with transaction.atomic(using=self.db):
+            stats = self.select_for_update().first() or self.get_or_create()[0]
+            self.filter(pk=stats.pk).update(**self.actual())
+            stats.refresh_from_db()
+
+        return stats
+
+
+class SpacecraftUsageManager(models.Manager):
+    def get_spacecrafts_by_mission_count(self):
+        return (
+            self.select_related('spacecraft')
+            .order_by(
+                '-mission_count',
+                'spacecraft__name'
+            )
+        )
+
+    def with_actual_counts(self):
+        """
+        Annotates every row with actual_mission_count and actual_astronaut_count,
+        counted from the missions of its spacecraft rather than read from the stored columns.
+        """
+        mission_model = self.model.spacecraft.field.related_model.missions.field.model
+
+        missions = (
+            mission_model.objects
+            .filter(spacecraft_id=OuterRef('pk'))
+            .order_by()
+            .values('spacecraft_id')
+            .annotate(total=Count('*'))
+            .values('total')
+        )
+        astronauts = (
+            mission_model.astronauts.through.objects
+            .filter(mission__spacecraft_id=OuterRef('pk'))
+            .order_by()
+            .values('mission__spacecraft_id')
+            .annotate(total=Count('astronaut_id', distinct=True))
+            .values('total')
+        )
+
+        return self.annotate(
+            actual_mission_count=Coalesce(Subquery(missions), 0),
+            actual_astronaut_count=Coalesce(Subquery(astronauts), 0),
+        )
+
+    def with_drifted_counts(self):
+        """
+        Returns the rows whose stored counts differ from the actual counts.
+        """
+        return (
+            self.with_actual_counts()
+            .exclude(
+                mission_count=F('actual_mission_count'),
+                astronaut_count=F('actual_astronaut_count'),
+            )
+        )
+
+    def recount(self, spacecraft_ids):
+        """
+        Recomputes the counts of the given spacecraft in a single UPDATE.
+        Spacecraft without a row are left alone; use refresh() to create it.
+
+        Parameters:
+            spacecraft_ids (iterable): Primary keys of the spacecraft to recount.
+
+        Returns:
+            int: The number of rows that were updated.
+        """
+        actual = self.with_actual_counts().filter(pk=OuterRef('pk'))
+
+        return (
+            self.filter(pk__in=spacecraft_ids)
+            .update(
+                mission_count=Subquery(actual.values('actual_mission_count')),
+                astronaut_count=Subquery(actual.values('actual_astronaut_count')),
+            )
+        )
+
+    def refresh(self, spacecraft_ids):
+        """
+        Creates the missing rows of the given spacecraft and recomputes their counts.
+
+        Parameters:
+            spacecraft_ids (iterable): Primary keys of the spacecraft to refresh. None values are ignored.
+
+        Returns:
+            int: The number of rows that were refreshed.
+        """
+        spacecraft_ids = {pk for pk in spacecraft_ids if pk is not None}
+        if not spacecraft_ids:
+            return 0
+
+        spacecraft_model = self.model.spacecraft.field.related_model
+        existing = spacecraft_model.objects.filter(pk__in=spacecraft_ids).values_list('pk', flat=True)
+
+        self.bulk_create(
+            [self.model(spacecraft_id=pk) for pk in existing],
+            ignore_conflicts=True,
+        )
+
+        return self.recount(spacecraft_ids)
+
+    def rebuild(self):
+        """
+        Creates a row for every spacecraft that has none and repairs every drifted row in a single UPDATE.
+        Both bypass signals, so the cached reports reading the usage statistics are invalidated here.
+
+        Returns:
+            int: The number of rows that were corrected.
+        """
+        spacecraft_model = self.model.spacecraft.field.related_model
+        missing = spacecraft_model.objects.filter(usage__isnull=True).values_list('pk', flat=True)
+
+        created = self.bulk_create(
+            [self.model(spacecraft_id=pk) for pk in missing],
+            ignore_conflicts=True,
+        )
+        fixed = self.recount(self.with_drifted_counts().values('pk'))
+
+        if created or fixed:
+            invalidate(self.model)
+
+        return fixed
+
+
+class MissionQuerySet(KeysetPaginationMixin, models.QuerySet):
+    def page_by_launch_date(self, cursor=None, per_page=25):
+        """
+        Returns a page of missions ordered by launch date, seeking on the (launch_date, id) index.
+        """
+        return self.keyset_page(('launch_date', 'id'), cursor, per_page)
+
+    def assign_crews(self, crews, batch_size=1000):
+        """
+        Adds astronauts to the crews of many missions at once.
+
+        The missions are locked, then their current crews and spacecraft capacities are loaded in a single
+        aggregate query, so concurrent calls for the same missions cannot both pass the capacity check.
+        The new links are inserted with chunked INSERT ... ON CONFLICT DO NOTHING RETURNING statements in
+        the same transaction, and a single crews_assigned signal is sent for the links that were actually
+        inserted, instead of an m2m_changed signal per mission.
+
+        Parameters:
+            crews (dict): {mission id: astronaut ids} to add. Astronauts already on a crew are skipped.
+            batch_size (int): The number of links inserted per query.
+
+        Returns:
+            int: The number of links created.
+
+        Raises:
+            ValidationError: If a mission or astronaut does not exist or a crew would exceed its spacecraft's
+                capacity. Nothing is assigned in that case.
+        """
+        crews = {mission_id: set(astronaut_ids) for mission_id, astronaut_ids in crews.items()}
+
+        through = self.model.astronauts.through
+        astronaut_model = self.model.astronauts.field.related_model
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        mission_column = quote(through._meta.get_field('mission').column)
+        astronaut_column = quote(through._meta.get_field('astronaut').column)
+
+        sql = f"""
+            INSERT INTO {quote(through._meta.db_table)} ({mission_column}, {astronaut_column})
+            SELECT * FROM unnest(%s, %s)
+            ON CONFLICT DO NOTHING
+            RETURNING {mission_column}, {astronaut_column}
+        """
+
+        with transaction.atomic(using=self.db):
+            # Locked in primary key order, so concurrent calls cannot deadlock on each other's missions
+            list(self.filter(pk__in=crews).order_by('pk').select_for_update().values_list('pk', flat=True))
+
+            current = (
+                self.filter(pk__in=crews)
+                .order_by()
+                .values_list('pk', 'spacecraft__capacity')
+                .annotate(crew=ArrayAgg('astronauts__id', filter=Q(astronauts__isnull=False), default=[]))
+            )
+
+            new_links = {}
+            errors = []
+            found = set()
+
+            for mission_id, capacity, crew in current:
+                found.add(mission_id)
+                new = crews[mission_id].difference(crew)
+                if len(crew) + len(new) > capacity:
+                    errors.append(
+                        f'Mission {mission_id} would have {len(crew) + len(new)} astronauts, '
+                        f'but its spacecraft holds {capacity}.'
+                    )
+                elif new:
+                    new_links[mission_id] = sorted(new)
+
+            errors.extend(f'Mission {mission_id} does not exist.' for mission_id in crews.keys() - found)
+
+            astronaut_ids = set().union(*crews.values())
+            existing = astronaut_model.objects.using(self.db).filter(pk__in=astronaut_ids).values_list('pk', flat=True)
+            errors.extend(
+                f'Astronaut {astronaut_id} does not exist.'
+                for astronaut_id in sorted(astronaut_ids.difference(existing))
+            )
+
+            if errors:
+                raise ValidationError(errors)
+
+            rows = [
+                (mission_id, astronaut_id)
+                for mission_id, astronaut_ids in new_links.items()
+                for astronaut_id in astronaut_ids
+            ]
+
+            links = {}
+            with connection.cursor() as cursor:
+                for start in range(0, len(rows), batch_size):
+                    mission_ids, astronaut_ids = zip(*rows[start:start + batch_size])
+                    cursor.execute(sql, [list(mission_ids), list(astronaut_ids)])
+                    # Links added concurrently through Mission.astronauts are skipped by the conflict clause
+                    for mission_id, astronaut_id in cursor.fetchall():
+                        links.setdefault(mission_id, []).append(astronaut_id)
+
+            if links:
+                crews_assigned.send(sender=self.model, links=links)
+
+        return sum(len(astronaut_ids) for astronaut_ids in links.values())
+
+    def with_summary(self):
+        """
+        Loads the commander and spacecraft with the missions and annotates every mission with:
+            astronaut_names: The names of its astronauts ordered by name, separated by ', '.
+            total_spacewalks: The sum of its astronauts' spacewalks.
+
+        Both annotations are correlated subqueries over the mission-astronaut table, so a summary
+        of any number of missions is fetched in a single query.
+        """
+        crew = (
+            self.model.astronauts.through.objects
+            .filter(mission_id=OuterRef('pk'))
+            .order_by()
+            .values('mission_id')
+        )
+
+        return (
+            self.select_related(
+                'commander',
+                'spacecraft'
+            )
+            .annotate(
+                astronaut_names=Coalesce(
+                    Subquery(
+                        crew.annotate(
+                            names=StringAgg('astronaut__name', ', ', ordering='astronaut__name')
+                        ).values('names')
+                    ),
+                    Value(''),
+                    output_field=models.TextField(),
+                ),
+                total_spacewalks=Coalesce(
+                    Subquery(
+                        crew.annotate(
+                            total=Sum('astronaut__spacewalks')
+                        ).values('total')
+                    ),
+                    0,
+                ),
+            )
+        )
@@ -0,0 +1,61 @@
+# Generated by Django 5.0.4 on 2026-10-17 03:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_mission_counters(apps, schema_editor):
+    Astronaut = apps.get_model('main_app', 'Astronaut')
+    Mission = apps.get_model('main_app', 'Mission')
+
+    crew = (
+        Mission.astronauts.through.objects
+        .filter(astronaut_id=OuterRef('pk'))
+        .order_by()
+        .values('astronaut_id')
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    commanded = (
+        Mission.objects
+        .filter(commander_id=OuterRef('pk'))
+        .order_by()
+        .values('commander_id')
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+
+    Astronaut.objects.update(
+        missions_count=Coalesce(Subquery(crew), 0),
+        commanded_missions_count=Coalesce(Subquery(commanded), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_astronaut_name_trgm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='astronaut',
+            name='commanded_missions_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='astronaut',
+            name='missions_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_mission_counters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='astronaut',
+            index=models.Index(fields=['-missions_count', 'phone_number'], name='astronaut_missions_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='astronaut',
+            index=models.Index(fields=['-commanded_missions_count', 'phone_number'], name='astronaut_commanded_rank'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_astronaut_mission_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['status', '-launch_date'], name='mission_status_launch_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(condition=models.Q(('status', 'Completed')), fields=['-launch_date'], name='mission_completed_launch_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(condition=models.Q(('status', 'Planned')), fields=['spacecraft'], name='mission_planned_craft_idx'),
+        ),
+    ]
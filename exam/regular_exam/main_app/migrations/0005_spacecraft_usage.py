@@ -0,0 +1,49 @@
+# Generated by Django 5.0.4 on 2026-10-17 03:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_spacecraft_usage(apps, schema_editor):
+    Spacecraft = apps.get_model('main_app', 'Spacecraft')
+    SpacecraftUsage = apps.get_model('main_app', 'SpacecraftUsage')
+
+    usage = (
+        Spacecraft.objects
+        .annotate(
+            num_missions=Count('missions', distinct=True),
+            num_astronauts=Count('missions__astronauts', distinct=True),
+        )
+        .values_list('pk', 'num_missions', 'num_astronauts')
+    )
+
+    SpacecraftUsage.objects.bulk_create(
+        [
+            SpacecraftUsage(spacecraft_id=pk, mission_count=num_missions, astronaut_count=num_astronauts)
+            for pk, num_missions, num_astronauts in usage.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_mission_status_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpacecraftUsage',
+            fields=[
+                ('spacecraft', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='usage', serialize=False, to='main_app.spacecraft')),
+                ('mission_count', models.IntegerField(default=0, editable=False)),
+                ('astronaut_count', models.IntegerField(default=0, editable=False)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-mission_count'], name='spacecraft_usage_rank')],
+            },
+        ),
+        migrations.RunPython(fill_spacecraft_usage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-17 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_spacecraft_usage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='astronaut',
+            index=models.Index(fields=['name', 'id'], name='astronaut_name_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['launch_date', 'id'], name='mission_launch_keyset'),
+        ),
+    ]
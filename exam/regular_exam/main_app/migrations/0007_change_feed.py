@@ -0,0 +1,55 @@
+# Generated by Django 5.0.4 on 2026-10-17 03:53
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0006_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeFeedWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('consumer', models.CharField(max_length=100)),
+                ('model', models.CharField(max_length=100)),
+                ('updated_at', models.DateTimeField(null=True)),
+                ('object_id', models.BigIntegerField(null=True)),
+                ('deleted_at', models.DateTimeField(null=True)),
+                ('tombstone_id', models.BigIntegerField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='astronaut',
+            index=models.Index(fields=['updated_at', 'id'], name='astronaut_changes'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['updated_at', 'id'], name='mission_changes'),
+        ),
+        migrations.AddIndex(
+            model_name='spacecraft',
+            index=models.Index(fields=['updated_at', 'id'], name='spacecraft_changes'),
+        ),
+        migrations.AddConstraint(
+            model_name='changefeedwatermark',
+            constraint=models.UniqueConstraint(fields=('consumer', 'model'), name='watermark_consumer_model'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['model', 'deleted_at', 'id'], name='tombstone_changes'),
+        ),
+    ]
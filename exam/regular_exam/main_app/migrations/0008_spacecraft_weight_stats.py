@@ -0,0 +1,34 @@
+# Generated by Django 5.0.4 on 2026-10-17 04:44
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_spacecraft_weight_stats(apps, schema_editor):
+    Spacecraft = apps.get_model('main_app', 'Spacecraft')
+    SpacecraftWeightStats = apps.get_model('main_app', 'SpacecraftWeightStats')
+
+    SpacecraftWeightStats.objects.create(**Spacecraft.objects.aggregate(
+        total_weight=Coalesce(Sum('weight'), 0.0),
+        spacecraft_count=Count('pk'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0007_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpacecraftWeightStats',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, editable=False, primary_key=True, serialize=False)),
+                ('total_weight', models.FloatField(default=0, editable=False)),
+                ('spacecraft_count', models.IntegerField(default=0, editable=False)),
+            ],
+        ),
+        migrations.RunPython(fill_spacecraft_weight_stats, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,6 @@
 from .astronaut import Astronaut
 from .spacecraft import Spacecraft
 from .mission import Mission
+from .spacecraft_usage import SpacecraftUsage
+from .spacecraft_weight_stats import SpacecraftWeightStats
+from .change_feed import Tombstone, ChangeFeedWatermark
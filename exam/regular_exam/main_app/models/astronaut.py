@@ -1,5 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core import validators
 from django.db import models
+from django.db.models.functions import Upper
 from .base import TimeStampedMixin, NamedMixin
 from main_app.managers import AstronautManager
 
@@ -13,12 +15,26 @@ class Astronaut(NamedMixin, TimeStampedMixin):
         is_active (BooleanField): Indicates whether the astronaut is currently active.
         date_of_birth (DateField): The date of birth of the astronaut.
         spacewalks (IntegerField): The number of spacewalks performed by the astronaut.
+        missions_count (IntegerField): The number of missions the astronaut takes part in.
+        commanded_missions_count (IntegerField): The number of missions the astronaut commands.
         objects (AstronautManager): Custom manager for Astronaut model.
 
     Validators:
         phone_number: Must be a valid phone number consisting of exactly 15 digits. Must be unique.
         date_of_birth: Must be a valid date in the format 'YYYY-MM-DD'.
         spacewalks: Must be a non-negative integer.
+
+    Indexes:
+        name: Trigram GIN index on UPPER(name), used by case-insensitive substring searches.
+        phone_number: The unique constraint's B-tree indexes also serve prefix searches.
+        missions_count, commanded_missions_count: (count DESC, phone_number) indexes for the leaderboards.
+        (name, id): Keyset pagination by name.
+        (updated_at, id): The change feed, inherited from TimeStampedMixin.
+
+    Note:
+        missions_count and commanded_missions_count are kept up to date by the handlers in main_app.signals.
+        Writes that bypass signals (bulk_create, QuerySet.update, raw SQL) must be followed by
+        'python manage.py rebuild_counters', which verifies and repairs them.
     """
 
     phone_number = models.CharField(
@@ -51,4 +67,35 @@ class Astronaut(NamedMixin, TimeStampedMixin):
         ],
     )
 
+    missions_count = models.IntegerField(
+        default=0,
+        editable=False,
+    )
+
+    commanded_missions_count = models.IntegerField(
+        default=0,
+        editable=False,
+    )
+
     objects = AstronautManager()
+
+    class Meta(TimeStampedMixin.Meta):
+        indexes = [
+            *TimeStampedMixin.Meta.indexes,
+            GinIndex(
+                OpClass(Upper('name'), name='gin_trgm_ops'),
+                name='astronaut_name_trgm',
+            ),
+            models.Index(
+                fields=['-missions_count', 'phone_number'],
+                name='astronaut_missions_rank',
+            ),
+            models.Index(
+                fields=['-commanded_missions_count', 'phone_number'],
+                name='astronaut_commanded_rank',
+            ),
+            models.Index(
+                fields=['name', 'id'],
+                name='astronaut_name_keyset',
+            ),
+        ]
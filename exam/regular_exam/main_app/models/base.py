@@ -9,8 +9,12 @@ class TimeStampedMixin(models.Model):
     Attributes:
         updated_at (DateTimeField): The date and time when the object was last updated.
 
+    Indexes:
+        (updated_at, id): Reading the rows changed since a watermark, see main_app.change_feed.
+
     Note:
         This model should be used as a mixin for other models. It should not be instantiated directly.
+        Models that declare their own Meta should inherit TimeStampedMixin.Meta and extend its indexes.
     """
 
     updated_at = models.DateTimeField(
@@ -19,6 +23,12 @@ class TimeStampedMixin(models.Model):
 
     class Meta:
         abstract = True
+        indexes = [
+            models.Index(
+                fields=['updated_at', 'id'],
+                name='%(class)s_changes',
+            ),
+        ]
 
 
 class NamedMixin(models.Model):
@@ -0,0 +1,88 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    A model recording the deletion of a row, so change feed consumers can delete it too.
+
+    Attributes:
+        model (CharField): The label of the deleted row's model, e.g. 'main_app.mission'.
+        object_id (BigIntegerField): The primary key of the deleted row.
+        deleted_at (DateTimeField): The date and time of the deletion.
+
+    Indexes:
+        (model, deleted_at, id): Reading the deletions since a watermark.
+
+    Note:
+        Tombstones are written by the handlers in main_app.signals. Deletions that bypass signals
+        (raw SQL) are not recorded. Once every consumer has passed them they can be removed
+        with main_app.change_feed.purge_tombstones().
+    """
+
+    model = models.CharField(
+        max_length=100,
+    )
+
+    object_id = models.BigIntegerField()
+
+    deleted_at = models.DateTimeField(
+        default=timezone.now,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['model', 'deleted_at', 'id'],
+                name='tombstone_changes',
+            ),
+        ]
+
+
+class ChangeFeedWatermark(models.Model):
+    """
+    A model holding how far a change feed consumer has read the changes of a model.
+
+    Attributes:
+        consumer (CharField): The name of the consumer, e.g. 'warehouse-sync'.
+        model (CharField): The label of the model being read, e.g. 'main_app.mission'.
+        updated_at (DateTimeField): The updated_at of the last changed row read.
+        object_id (BigIntegerField): The primary key of the last changed row read.
+        deleted_at (DateTimeField): The deleted_at of the last tombstone read.
+        tombstone_id (BigIntegerField): The primary key of the last tombstone read.
+
+    Validators:
+        consumer, model: Must be unique together.
+    """
+
+    consumer = models.CharField(
+        max_length=100,
+    )
+
+    model = models.CharField(
+        max_length=100,
+    )
+
+    updated_at = models.DateTimeField(
+        null=True,
+    )
+
+    object_id = models.BigIntegerField(
+        null=True,
+    )
+
+    deleted_at = models.DateTimeField(
+        null=True,
+    )
+
+    tombstone_id = models.BigIntegerField(
+        null=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['consumer', 'model'],
+                name='watermark_consumer_model',
+            ),
+        ]
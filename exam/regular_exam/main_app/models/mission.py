@@ -1,8 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from .base import TimeStampedMixin, NamedMixin
 from .choices import MissionStatusChoices
 from .astronaut import Astronaut
 from .spacecraft import Spacecraft
+from main_app.managers import MissionQuerySet
 
 
 class Mission(NamedMixin, TimeStampedMixin):
@@ -16,6 +17,14 @@ class Mission(NamedMixin, TimeStampedMixin):
         spacecraft (ForeignKey): The spacecraft associated with the mission.
         astronauts (ManyToManyField): The astronauts participating in the mission.
         commander (ForeignKey): The commander of the mission.
+        objects (MissionQuerySet): Custom manager for Mission model.
+
+    Indexes:
+        (status, launch_date DESC): Latest missions in a given status.
+        launch_date DESC where status is 'Completed': The last completed mission.
+        spacecraft where status is 'Planned': Spacecraft planned for missions.
+        (launch_date, id): Keyset pagination by launch date.
+        (updated_at, id): The change feed, inherited from TimeStampedMixin.
     """
 
     description = models.TextField(
@@ -48,3 +57,33 @@ class Mission(NamedMixin, TimeStampedMixin):
         null=True,
         related_name='commanded_missions',
     )
+
+    objects = MissionQuerySet.as_manager()
+
+    class Meta(TimeStampedMixin.Meta):
+        indexes = [
+            *TimeStampedMixin.Meta.indexes,
+            models.Index(
+                fields=['status', '-launch_date'],
+                name='mission_status_launch_idx',
+            ),
+            models.Index(
+                fields=['-launch_date'],
+                condition=models.Q(status=MissionStatusChoices.COMPLETED),
+                name='mission_completed_launch_idx',
+            ),
+            models.Index(
+                fields=['spacecraft'],
+                condition=models.Q(status=MissionStatusChoices.PLANNED),
+                name='mission_planned_craft_idx',
+            ),
+            models.Index(
+                fields=['launch_date', 'id'],
+                name='mission_launch_keyset',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The counter handlers in main_app.signals must commit or roll back together with the mission
+        with transaction.atomic():
+            super().save(*args, **kwargs)
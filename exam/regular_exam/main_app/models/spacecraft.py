@@ -1,6 +1,7 @@
 from django.core import validators
-from django.db import models
+from django.db import models, transaction
 from .base import TimeStampedMixin, NamedMixin
+from main_app.managers import SpacecraftQuerySet
 
 
 class Spacecraft(NamedMixin, TimeStampedMixin):
@@ -12,10 +13,14 @@ class Spacecraft(NamedMixin, TimeStampedMixin):
         capacity (PositiveSmallIntegerField): The capacity of the spacecraft.
         weight (FloatField): The weight of the spacecraft.
         launch_date (DateField): The launch date of the spacecraft.
+        objects (SpacecraftQuerySet): Custom manager for Spacecraft model.
 
     Validators:
         capacity: Must be at least 1.
         weight: Must be a positive number.
+
+    Indexes:
+        (updated_at, id): The change feed, inherited from TimeStampedMixin.
     """
 
     manufacturer = models.CharField(
@@ -41,3 +46,13 @@ class Spacecraft(NamedMixin, TimeStampedMixin):
     )
 
     launch_date = models.DateField()
+
+    objects = SpacecraftQuerySet.as_manager()
+
+    class Meta(TimeStampedMixin.Meta):
+        pass
+
+    def save(self, *args, **kwargs):
+        # The weight total handlers in main_app.signals must commit or roll back together with the spacecraft
+        with transaction.atomic():
+            super().save(*args, **kwargs)
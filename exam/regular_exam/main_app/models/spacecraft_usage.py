@@ -0,0 +1,50 @@
+from django.db import models
+from .spacecraft import Spacecraft
+from main_app.managers import SpacecraftUsageManager
+
+
+class SpacecraftUsage(models.Model):
+    """
+    A statistics model holding how much a spacecraft has been used.
+
+    Attributes:
+        spacecraft (OneToOneField): The spacecraft the statistics belong to. Also the primary key.
+        mission_count (IntegerField): The number of missions flown with the spacecraft.
+        astronaut_count (IntegerField): The number of distinct astronauts on those missions.
+        objects (SpacecraftUsageManager): Custom manager for SpacecraftUsage model.
+
+    Indexes:
+        mission_count DESC: Used by the most used spacecraft report.
+
+    Note:
+        The rows are refreshed by the handlers in main_app.signals whenever a mission or its crew changes,
+        recounting only the affected spacecraft. Writes that bypass signals (bulk_create, QuerySet.update,
+        raw SQL) must be followed by 'python manage.py rebuild_counters', which verifies and repairs them.
+    """
+
+    spacecraft = models.OneToOneField(
+        to=Spacecraft,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='usage',
+    )
+
+    mission_count = models.IntegerField(
+        default=0,
+        editable=False,
+    )
+
+    astronaut_count = models.IntegerField(
+        default=0,
+        editable=False,
+    )
+
+    objects = SpacecraftUsageManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-mission_count'],
+                name='spacecraft_usage_rank',
+            ),
+        ]
@@ -0,0 +1,38 @@
+from django.db import models
+from main_app.managers import SpacecraftWeightStatsManager
+
+
+class SpacecraftWeightStats(models.Model):
+    """
+    A statistics model holding the running weight total of all spacecraft in a single row.
+
+    Attributes:
+        id (PositiveSmallIntegerField): Always 1, so there can be only one row.
+        total_weight (FloatField): The sum of the weights of all spacecraft.
+        spacecraft_count (IntegerField): The number of spacecraft.
+        objects (SpacecraftWeightStatsManager): Custom manager for SpacecraftWeightStats model.
+
+    Note:
+        The row is updated by the handlers in main_app.signals whenever a spacecraft is created, deleted or
+        changes its weight, and by Spacecraft.objects.adjust_weight() in the same statement as the spacecraft.
+        Writes that bypass signals (bulk_create, QuerySet.update, raw SQL) must be followed by
+        'python manage.py rebuild_counters', which verifies and repairs it.
+    """
+
+    id = models.PositiveSmallIntegerField(
+        primary_key=True,
+        default=1,
+        editable=False,
+    )
+
+    total_weight = models.FloatField(
+        default=0,
+        editable=False,
+    )
+
+    spacecraft_count = models.IntegerField(
+        default=0,
+        editable=False,
+    )
+
+    objects = SpacecraftWeightStatsManager()
@@ -0,0 +1,197 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a cursor cannot be decoded or does not match the paginator's ordering.
+    """
+
+
+def key_fields(model, ordering):
+    """
+    Returns the model fields of an ordering such as ('name', 'id') or ('-launch_date', '-pk'),
+    or None if any part of it is not a concrete field of the model.
+    """
+    fields = []
+
+    for name in ordering:
+        if not isinstance(name, str):
+            return None
+        name = name.lstrip('-')
+        if name == 'pk':
+            fields.append(model._meta.pk)
+            continue
+        field = next((f for f in model._meta.concrete_fields if name in (f.name, f.attname)), None)
+        if field is None:
+            return None
+        fields.append(field)
+
+    return fields
+
+
+def key_values(obj, fields):
+    """
+    Returns the values of an object's key fields, as returned by key_fields().
+    """
+    return [getattr(obj, field.attname) for field in fields]
+
+
+def seek_filter(ordering, values):
+    """
+    Returns a Q matching the rows that come after the given key values in the given ordering.
+
+    For ('name', 'id') this is name >= v1 AND (name > v1 OR (name = v1 AND id > v2)).
+    The leading condition is redundant, but lets the database seek on an index of the first key.
+    """
+    names = [name.lstrip('-') for name in ordering]
+    ascending = [not name.startswith('-') for name in ordering]
+
+    condition = Q()
+    for position in range(len(names)):
+        lookup = 'gt' if ascending[position] else 'lt'
+        branch = Q(**{f'{names[position]}__{lookup}': values[position]})
+        for previous in range(position):
+            branch &= Q(**{names[previous]: values[previous]})
+        condition |= branch
+
+    leading = 'gte' if ascending[0] else 'lte'
+    return Q(**{f'{names[0]}__{leading}': values[0]}) & condition
+
+
+def encode_cursor(values, backwards=False):
+    payload = json.dumps({'k': values, 'b': backwards}, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, fields):
+    """
+    Decodes a cursor created by encode_cursor() into its key values and direction.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or its keys do not fit the given fields.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        values, backwards = list(payload['k']), bool(payload['b'])
+    except (binascii.Error, ValueError, TypeError, KeyError) as error:
+        raise InvalidCursor('The cursor is not valid.') from error
+
+    if len(values) != len(fields):
+        raise InvalidCursor('The cursor does not match the ordering.')
+
+    try:
+        return [field.to_python(value) for field, value in zip(fields, values)], backwards
+    except ValidationError as error:
+        raise InvalidCursor('The cursor does not match the ordering.') from error
+
+
+class KeysetPage:
+    """
+    A page of a KeysetPaginator.
+
+    Attributes:
+        object_list (list): The objects on the page.
+        next_cursor (str): The cursor of the following page, or None on the last page.
+        previous_cursor (str): The cursor of the preceding page, or None on the first page.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by seeking on its ordering keys instead of using OFFSET,
+    so every page costs the same no matter how deep it is.
+
+    The ordering must end in a unique key, e.g. ('name', 'id') or ('-launch_date', '-id'), and its
+    fields must not be NULL. Cursors are opaque, URL-safe strings holding the keys of a page boundary.
+
+    Attributes:
+        queryset (QuerySet): The queryset to paginate. Its own ordering is replaced.
+        ordering (tuple): The field names to order and seek by, with '-' for descending order.
+        per_page (int): The number of objects per page.
+    """
+
+    def __init__(self, queryset, ordering, per_page=25):
+        self.fields = key_fields(queryset.model, ordering)
+        if self.fields is None:
+            raise ValueError(f'Keyset pagination needs concrete fields of {queryset.model.__name__}, got {ordering}.')
+
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+
+    def page(self, cursor=None):
+        """
+        Returns the page following (or, for a previous_cursor, preceding) the cursor's boundary,
+        or the first page if there is no cursor.
+
+        Raises:
+            InvalidCursor: If the cursor is not valid for this paginator.
+        """
+        values, backwards = decode_cursor(cursor, self.fields) if cursor else (None, False)
+
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(seek_filter(ordering, values))
+
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+
+        if backwards:
+            objects.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        return KeysetPage(
+            objects,
+            encode_cursor(key_values(objects[-1], self.fields)) if objects and has_next else None,
+            encode_cursor(key_values(objects[0], self.fields), backwards=True) if objects and has_previous else None,
+        )
+
+
+class KeysetPaginationMixin:
+    """
+    QuerySet mixin adding keyset pagination to a model's queryset and manager.
+    """
+
+    def keyset_page(self, ordering, cursor=None, per_page=25):
+        """
+        Returns a page of the queryset ordered by the given keys.
+
+        Parameters:
+            ordering (tuple): The field names to order and seek by, ending in a unique key, e.g. ('name', 'id').
+            cursor (str): The next_cursor or previous_cursor of a page, or None for the first page.
+            per_page (int): The number of objects per page.
+
+        Returns:
+            KeysetPage: The page, with the cursors of its neighbours.
+        """
+        return KeysetPaginator(self, ordering, per_page).page(cursor)
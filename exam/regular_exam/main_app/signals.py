@@ -0,0 +1,263 @@
+from collections import Counter
+
+from django.db.models import F
+from django.db.models.signals import m2m_changed, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from main_app.cache import invalidate
+from main_app.dispatch import crews_assigned
+from main_app.models import Astronaut, Spacecraft, Mission, SpacecraftUsage, SpacecraftWeightStats, Tombstone
+
+
+def change_counter(field_name, deltas):
+    """
+    Adds the given deltas to a counter field of Astronaut, with one UPDATE per distinct delta.
+    updated_at is set as well, so the change feed picks up the new counts.
+
+    Parameters:
+        field_name (str): 'missions_count' or 'commanded_missions_count'.
+        deltas (dict): {astronaut id: delta}.
+    """
+    by_delta = {}
+    for astronaut_id, delta in deltas.items():
+        if astronaut_id is not None and delta:
+            by_delta.setdefault(delta, []).append(astronaut_id)
+
+    for delta, astronaut_ids in by_delta.items():
+        Astronaut.objects.filter(pk__in=astronaut_ids).update(
+            **{field_name: F(field_name) + delta},
+            updated_at=timezone.now(),
+        )
+
+
+@receiver(m2m_changed, sender=Mission.astronauts.through)
+def update_missions_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keeps Astronaut.missions_count in step with the mission-astronaut table.
+
+    Additions use pk_set, which Django already limits to the links that are new. Removals and clears
+    are counted from the table before the rows are deleted, since their pk_set may contain ids that
+    were never linked.
+    """
+    if action == 'post_add':
+        if reverse:
+            change_counter('missions_count', {instance.pk: len(pk_set)})
+        else:
+            change_counter('missions_count', Counter(pk_set))
+        return
+
+    if action not in ('pre_remove', 'pre_clear'):
+        return
+
+    if reverse:
+        links = sender.objects.filter(astronaut_id=instance.pk)
+        if action == 'pre_remove':
+            links = links.filter(mission_id__in=pk_set)
+        change_counter('missions_count', {instance.pk: -links.count()})
+    else:
+        links = sender.objects.filter(mission_id=instance.pk)
+        if action == 'pre_remove':
+            links = links.filter(astronaut_id__in=pk_set)
+        change_counter('missions_count', Counter(
+            {astronaut_id: -1 for astronaut_id in links.values_list('astronaut_id', flat=True)}
+        ))
+
+
+@receiver(pre_save, sender=Mission)
+def remember_previous_relations(sender, instance, **kwargs):
+    # Mission.save() runs in a transaction, so the row stays locked until the counters are updated and
+    # a concurrent save of the same mission reads the relations this one writes
+    previous = (
+        Mission.objects
+        .select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('commander_id', 'spacecraft_id')
+        .first()
+    ) if instance.pk else None
+
+    instance._previous_commander_id, instance._previous_spacecraft_id = previous or (None, None)
+
+
+@receiver(post_save, sender=Mission)
+def update_commanded_missions_count(sender, instance, created, **kwargs):
+    previous_commander_id = getattr(instance, '_previous_commander_id', None)
+
+    if previous_commander_id != instance.commander_id:
+        deltas = Counter()
+        deltas[previous_commander_id] -= 1
+        deltas[instance.commander_id] += 1
+        change_counter('commanded_missions_count', deltas)
+
+
+@receiver(pre_delete, sender=Mission)
+def release_mission_counters(sender, instance, **kwargs):
+    """
+    Decrements the counters of a mission's commander and crew before it is deleted.
+
+    The mission-astronaut rows are removed by the deletion cascade without m2m_changed,
+    so they are counted here while they still exist.
+    """
+    change_counter('commanded_missions_count', {instance.commander_id: -1})
+
+    crew = Mission.astronauts.through.objects.filter(mission_id=instance.pk)
+    change_counter('missions_count', {
+        astronaut_id: -1 for astronaut_id in crew.values_list('astronaut_id', flat=True)
+    })
+
+
+@receiver(post_save, sender=Mission)
+def refresh_spacecraft_usage(sender, instance, created, **kwargs):
+    previous_spacecraft_id = getattr(instance, '_previous_spacecraft_id', None)
+
+    if created or previous_spacecraft_id != instance.spacecraft_id:
+        SpacecraftUsage.objects.refresh({previous_spacecraft_id, instance.spacecraft_id})
+
+
+@receiver(m2m_changed, sender=Mission.astronauts.through)
+def refresh_crew_spacecraft_usage(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Recounts the spacecraft whose missions gained or lost astronauts.
+
+    When astronauts are changed from the astronaut's side, the affected missions of a removal or clear
+    are looked up before their rows are deleted and recounted once they are gone.
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            SpacecraftUsage.objects.refresh([instance.spacecraft_id])
+        return
+
+    if action in ('pre_remove', 'pre_clear'):
+        missions = Mission.objects.filter(astronauts=instance)
+        if action == 'pre_remove':
+            missions = missions.filter(pk__in=pk_set)
+        instance._crew_spacecraft_ids = set(missions.values_list('spacecraft_id', flat=True))
+    elif action == 'post_add':
+        SpacecraftUsage.objects.refresh(
+            Mission.objects.filter(pk__in=pk_set).values_list('spacecraft_id', flat=True)
+        )
+    elif action in ('post_remove', 'post_clear'):
+        SpacecraftUsage.objects.refresh(instance.__dict__.pop('_crew_spacecraft_ids', ()))
+
+
+@receiver(pre_delete, sender=Astronaut)
+def remember_crew_spacecraft(sender, instance, **kwargs):
+    """
+    Remembers the spacecraft of a deleted astronaut's missions.
+
+    The mission-astronaut rows are removed by the deletion cascade without m2m_changed,
+    so the spacecraft are looked up here while the rows still exist and recounted once they are gone.
+    """
+    instance._crew_spacecraft_ids = set(
+        Mission.objects.filter(astronauts=instance).values_list('spacecraft_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Astronaut)
+def recount_crew_spacecraft_usage(sender, instance, **kwargs):
+    SpacecraftUsage.objects.recount(instance.__dict__.pop('_crew_spacecraft_ids', ()))
+
+
+@receiver(crews_assigned, sender=Mission)
+def count_assigned_crews(sender, links, **kwargs):
+    change_counter('missions_count', Counter(
+        astronaut_id
+        for astronaut_ids in links.values()
+        for astronaut_id in astronaut_ids
+    ))
+
+
+@receiver(crews_assigned, sender=Mission)
+def refresh_assigned_spacecraft_usage(sender, links, **kwargs):
+    SpacecraftUsage.objects.refresh(
+        Mission.objects
+        .filter(pk__in=links)
+        .values_list('spacecraft_id', flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_delete, sender=Mission)
+def recount_spacecraft_usage(sender, instance, **kwargs):
+    """
+    Recounts the spacecraft of a deleted mission.
+
+    Only an existing row is updated: when the mission is deleted because its spacecraft is,
+    creating a row here would reference a spacecraft that is about to disappear.
+    """
+    SpacecraftUsage.objects.recount([instance.spacecraft_id])
+
+
+@receiver(pre_save, sender=Spacecraft)
+def remember_previous_weight(sender, instance, **kwargs):
+    # Spacecraft.save() runs in a transaction, so the row stays locked until the weight total is updated
+    instance._previous_weight = (
+        Spacecraft.objects
+        .select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('weight', flat=True)
+        .first()
+    ) if instance.pk else None
+
+
+@receiver(post_save, sender=Spacecraft)
+def change_weight_stats(sender, instance, created, **kwargs):
+    previous_weight = instance.__dict__.pop('_previous_weight', None)
+
+    if created:
+        SpacecraftWeightStats.objects.change(float(instance.weight), 1)
+    elif previous_weight is not None and previous_weight != float(instance.weight):
+        SpacecraftWeightStats.objects.change(float(instance.weight) - previous_weight, 0)
+
+
+@receiver(pre_delete, sender=Spacecraft)
+def remember_deleted_weight(sender, instance, **kwargs):
+    """
+    Reads the stored weight of a deleted spacecraft, which may differ from the one on the instance
+    if it was changed since the instance was loaded. The deletion runs in a transaction, so the row
+    stays locked until the weight total is updated.
+    """
+    instance._deleted_weight = (
+        Spacecraft.objects
+        .select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('weight', flat=True)
+        .first()
+    )
+
+
+@receiver(post_delete, sender=Spacecraft)
+def release_weight_stats(sender, instance, **kwargs):
+    deleted_weight = instance.__dict__.pop('_deleted_weight', None)
+
+    if deleted_weight is not None:
+        SpacecraftWeightStats.objects.change(-deleted_weight, -1)
+
+
+@receiver(m2m_changed, sender=Mission.astronauts.through)
+def invalidate_cached_crew_reports(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate(sender)
+
+
+@receiver(crews_assigned, sender=Mission)
+def invalidate_assigned_crew_reports(sender, **kwargs):
+    invalidate(Mission.astronauts.through)
+
+
+def invalidate_cached_reports(sender, **kwargs):
+    invalidate(sender)
+
+
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+# Receivers are connected per model: a post_delete receiver without a sender would stop Django from
+# fast-deleting the rows of every model, including tombstones
+for model in (Astronaut, Spacecraft, Mission, Mission.astronauts.through, SpacecraftUsage):
+    post_save.connect(invalidate_cached_reports, sender=model)
+    post_delete.connect(invalidate_cached_reports, sender=model)
+
+for model in (Astronaut, Spacecraft, Mission):
+    post_delete.connect(record_tombstone, sender=model)
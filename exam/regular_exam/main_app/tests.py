@@ -1,3 +1,218 @@
-from django.test import TestCase
+import datetime
+import os
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase, tag
+
+from main_app.models import Astronaut, Mission, Spacecraft
+
+
+@tag('slow')
+@skipUnless(os.environ.get('RUN_SLOW_TESTS'), 'Loading a million missions is slow, set RUN_SLOW_TESTS=1 to run it')
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN output is PostgreSQL specific')
+class MissionIndexPlanTests(TestCase):
+    """
+    Checks with EXPLAIN that the hot Mission queries are served by the status/launch_date indexes
+    once the table holds a realistic number of missions.
+
+    Loading the missions takes a while, so the tests only run with RUN_SLOW_TESTS=1, e.g.
+    RUN_SLOW_TESTS=1 python manage.py test --tag slow
+    """
+
+    NUM_MISSIONS = 1_000_000
+    NUM_SPACECRAFTS = 1_000
+
+    @classmethod
+    def setUpTestData(cls):
+        # generate_series is much faster than the ORM at this size; about 1% of the missions are planned
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Spacecraft._meta.db_table}
+                    (updated_at, name, manufacturer, capacity, weight, launch_date)
+                SELECT now(), 'Spacecraft ' || i, 'Manufacturer', 5, 100 + i %% 500, DATE '2000-01-01' + i %% 5000
+                FROM generate_series(1, %s) AS i
+                """,
+                [cls.NUM_SPACECRAFTS],
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {Mission._meta.db_table}
+                    (updated_at, name, status, launch_date, spacecraft_id)
+                SELECT
+                    now(),
+                    'Mission ' || i,
+                    CASE WHEN i %% 100 = 0 THEN 'Planned' WHEN i %% 100 = 1 THEN 'Ongoing' ELSE 'Completed' END,
+                    DATE '2000-01-01' + i %% 9000,
+                    (SELECT min(id) FROM {Spacecraft._meta.db_table}) + i %% %s
+                FROM generate_series(1, %s) AS i
+                """,
+                [cls.NUM_SPACECRAFTS, cls.NUM_MISSIONS],
+            )
+            cursor.execute(f'ANALYZE {Spacecraft._meta.db_table}, {Mission._meta.db_table}')
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = queryset.explain()
+
+        self.assertTrue(any(name in plan for name in index_names), plan)
+        self.assertNotIn(f'Seq Scan on {Mission._meta.db_table}', plan)
+
+    def test_last_completed_mission_uses_status_index(self):
+        queryset = (
+            Mission.objects
+            .with_summary()
+            .filter(status='Completed')
+            .order_by('-launch_date')[:1]
+        )
+
+        # Either index serves it; the planner picks by size, which depends on the status distribution
+        self.assertUsesIndex(queryset, 'mission_completed_launch_idx', 'mission_status_launch_idx')
+
+    def test_latest_missions_by_status_use_status_launch_index(self):
+        queryset = (
+            Mission.objects
+            .filter(status='Ongoing')
+            .order_by('-launch_date')[:10]
+        )
+
+        self.assertUsesIndex(queryset, 'mission_status_launch_idx')
+
+    def test_spacecrafts_planned_for_missions_use_planned_partial_index(self):
+        queryset = (
+            Spacecraft.objects
+            .filter(missions__status='Planned', weight__gte=200.0)
+            .distinct()
+        )
+
+        self.assertUsesIndex(queryset, 'mission_planned_craft_idx')
+
+
+@skipUnless(connection.vendor == 'postgresql', 'assign_crews() inserts the links with PostgreSQL unnest()')
+class MissionCounterTests(TestCase):
+    """
+    Checks that the handlers in main_app.signals keep missions_count and commanded_missions_count
+    equal to the counts of the missions themselves.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.spacecraft = Spacecraft.objects.create(
+            name='Apollo',
+            manufacturer='NASA',
+            capacity=3,
+            weight=1000.0,
+            launch_date=datetime.date(1969, 7, 16),
+        )
+        cls.first, cls.second, cls.third, cls.fourth = (
+            Astronaut.objects.create(name=f'Astronaut {number}', phone_number=f'{number:015}')
+            for number in range(1, 5)
+        )
+
+    def create_mission(self, name='Mission', commander=None):
+        return Mission.objects.create(
+            name=name,
+            status='Planned',
+            launch_date=datetime.date(2030, 1, 1),
+            spacecraft=self.spacecraft,
+            commander=commander,
+        )
+
+    def assertCountersMatchMissions(self):
+        astronauts = Astronaut.objects.annotate(
+            num_missions=Count('missions', distinct=True),
+            num_commanded=Count('commanded_missions', distinct=True),
+        )
+
+        for astronaut in astronauts:
+            self.assertEqual(astronaut.missions_count, astronaut.num_missions, astronaut)
+            self.assertEqual(astronaut.commanded_missions_count, astronaut.num_commanded, astronaut)
+
+    def test_add_counts_new_links_only(self):
+        mission = self.create_mission()
+
+        mission.astronauts.add(self.first, self.second)
+        mission.astronauts.add(self.first, self.third)
+
+        self.assertCountersMatchMissions()
+
+    def test_remove_counts_linked_astronauts_only(self):
+        mission = self.create_mission()
+        mission.astronauts.add(self.first, self.second)
+
+        mission.astronauts.remove(self.first, self.third)
+
+        self.assertCountersMatchMissions()
+
+    def test_clear(self):
+        mission = self.create_mission()
+        mission.astronauts.add(self.first, self.second)
+
+        mission.astronauts.clear()
+
+        self.assertCountersMatchMissions()
+
+    def test_reverse_side_changes(self):
+        first_mission, second_mission = self.create_mission('First'), self.create_mission('Second')
+
+        self.first.missions.add(first_mission, second_mission)
+        self.first.missions.add(first_mission)
+        self.assertCountersMatchMissions()
+
+        self.first.missions.remove(first_mission)
+        self.assertCountersMatchMissions()
+
+        self.second.missions.add(first_mission, second_mission)
+        self.second.missions.clear()
+        self.assertCountersMatchMissions()
+
+    def test_commander_reassignment(self):
+        mission = self.create_mission(commander=self.first)
+        self.assertCountersMatchMissions()
+
+        mission.commander = self.second
+        mission.save()
+        self.assertCountersMatchMissions()
+
+        mission.commander = None
+        mission.save()
+        self.assertCountersMatchMissions()
+
+    def test_mission_deletion(self):
+        mission = self.create_mission(commander=self.first)
+        mission.astronauts.add(self.first, self.second)
+        self.create_mission('Kept', commander=self.first).astronauts.add(self.second)
+
+        mission.delete()
+
+        self.assertCountersMatchMissions()
+
+    def test_assign_crews(self):
+        first_mission, second_mission = self.create_mission('First'), self.create_mission('Second')
+        first_mission.astronauts.add(self.first)
+
+        created = Mission.objects.assign_crews({
+            first_mission.pk: [self.first.pk, self.second.pk],
+            second_mission.pk: [self.first.pk, self.third.pk],
+        }, batch_size=2)
+
+        self.assertEqual(created, 3)
+        self.assertCountersMatchMissions()
+
+    def test_assign_crews_conflicts_assign_nothing(self):
+        full_mission, other_mission = self.create_mission('Full'), self.create_mission('Other')
+        full_mission.astronauts.add(self.first, self.second)
+
+        conflicts = [
+            {full_mission.pk: [self.third.pk, self.fourth.pk], other_mission.pk: [self.first.pk]},
+            {other_mission.pk: [self.first.pk, 0]},
+            {0: [self.first.pk]},
+        ]
+        for crews in conflicts:
+            with self.subTest(crews=crews), self.assertRaises(ValidationError):
+                Mission.objects.assign_crews(crews)
+
+        self.assertFalse(other_mission.astronauts.exists())
+        self.assertCountersMatchMissions()
@@ -86,6 +86,20 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/ref/settings/#caches
+# The report cache in main_app.cache uses the default cache. Local memory is per process; switch to
+# 'django.core.cache.backends.filebased.FileBasedCache' with a directory LOCATION to share it between processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'regular-exam-reports',
+        'TIMEOUT': None,
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
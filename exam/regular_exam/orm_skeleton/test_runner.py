@@ -0,0 +1,91 @@
+import hashlib
+
+from django.conf import settings
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+from django.test.runner import DiscoverRunner
+
+
+class TemplateDatabaseTestRunner(DiscoverRunner):
+    """
+    Test runner that migrates PostgreSQL databases only once, into a reusable template database.
+
+    The template is named after a hash of every migration on disk, so it is rebuilt automatically
+    when a migration is added or changed, and older templates are dropped. The test database (and
+    every parallel worker database, which Django already clones with CREATE DATABASE ... TEMPLATE)
+    is then created from it, leaving only a no-op migrate for Django to run.
+
+    Other database engines are set up exactly like DiscoverRunner does.
+    """
+
+    def setup_databases(self, **kwargs):
+        for alias in connections:
+            connection = connections[alias]
+            if connection.vendor == 'postgresql':
+                connection.settings_dict['TEST']['TEMPLATE'] = self.prepare_template(connection)
+
+        return super().setup_databases(**kwargs)
+
+    def prepare_template(self, connection):
+        """
+        Returns the name of the migrated template database for a connection, creating it if needed.
+        """
+        name = connection.settings_dict['NAME']
+        template_prefix = f'{name}_template_'
+        template_name = template_prefix + migrations_fingerprint(connection)[:12]
+
+        with connection._nodb_cursor() as cursor:
+            cursor.execute('SELECT datname FROM pg_database WHERE datname LIKE %s', [template_prefix + '%'])
+            existing = [row[0] for row in cursor.fetchall()]
+
+            for stale_name in existing:
+                if stale_name != template_name:
+                    cursor.execute(f'DROP DATABASE IF EXISTS {connection.ops.quote_name(stale_name)}')
+
+        if template_name not in existing:
+            if self.verbosity >= 1:
+                self.log(f"Creating template database '{template_name}' for alias '{connection.alias}'...")
+            self.build_template(connection, template_name)
+
+        return template_name
+
+    def build_template(self, connection, template_name):
+        # Let Django create and migrate the template as if it were the test database, then switch back
+        test_settings = connection.settings_dict['TEST']
+        original_name = connection.settings_dict['NAME']
+        original_test_name = test_settings.get('NAME')
+        original_template = test_settings.get('TEMPLATE')
+
+        test_settings['NAME'] = template_name
+        test_settings['TEMPLATE'] = None
+        try:
+            connection.creation.create_test_db(
+                verbosity=max(self.verbosity - 1, 0),
+                autoclobber=True,
+                serialize=False,
+            )
+        finally:
+            # PostgreSQL refuses to copy a template that still has open connections
+            connection.close()
+            connection.settings_dict['NAME'] = original_name
+            settings.DATABASES[connection.alias]['NAME'] = original_name
+            test_settings['NAME'] = original_test_name
+            test_settings['TEMPLATE'] = original_template
+
+
+def migrations_fingerprint(connection):
+    """
+    Returns a SHA-256 hex digest of the names and source files of every migration on disk.
+    """
+    loader = MigrationLoader(connection, ignore_no_migrations=True, load=False)
+    loader.load_disk()
+
+    digest = hashlib.sha256()
+    for key, migration in sorted(loader.disk_migrations.items()):
+        digest.update(repr(key).encode())
+
+        module = __import__(migration.__module__, fromlist=['__file__'])
+        with open(module.__file__, 'rb') as file:
+            digest.update(file.read())
+
+    return digest.hexdigest()
@@ -1,6 +1,29 @@
+import functools
+import glob
+import hashlib
+import json
 import os
+import struct
 import zipfile
+import zlib
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Files and directories that are added to the archive
+PACKED_FILES = ['requirements.txt', 'manage.py', 'caller.py']
+PACKED_DIRS = ['main_app', 'orm_skeleton', 'migrations']
+
+# Directories that are never descended into
+EXCLUDED_DIRS = ['.git', '.idea', '__pycache__', 'node_modules']
+
+# Zip records written around the compressed entries, as laid out in the format's APPNOTE.TXT
+LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+CENTRAL_HEADER_SIGNATURE = b'PK\x01\x02'
+END_OF_CENTRAL_DIRECTORY = struct.Struct('<4s4H2LH')
+END_OF_CENTRAL_DIRECTORY_SIGNATURE = b'PK\x05\x06'
+UTF8_FLAG = 0x800
 
 
 def pack():
@@ -8,6 +31,11 @@ def pack():
     This function creates a zip archive of specific files and directories.
     It removes any old archive before creating a new one.
 
+    Directories such as venv are pruned while walking the tree instead of being filtered afterwards.
+    The archive comment holds a manifest with the SHA-256, size and mtime of every packed file. Files
+    whose size and mtime, or failing that their hash, match the previous archive's manifest are copied
+    over from it still compressed; the remaining files are read and compressed in parallel.
+
     Parameters:
     None
 
@@ -15,31 +43,177 @@ def pack():
     None
     """
 
-    # Remove old archive
-    for item in os.listdir('.'):
-        if item.endswith(".zip"):
-            os.remove(item)
+    previous_archive = _latest_archive()
+    previous_manifest, previous_entries = _read_previous(previous_archive) if previous_archive else ({}, {})
+    pack_file = functools.partial(
+        _pack_file,
+        previous_archive=previous_archive,
+        previous_manifest=previous_manifest,
+        previous_entries=previous_entries,
+    )
 
     # Get current date and time for archive name
     dt = datetime.datetime.now().strftime('%H-%M_%d.%m.%y')
+    archive_name = f'submission-{dt}.zip'
+    temp_name = f'.{archive_name}.tmp'
+
+    manifest = {}
+    written = []
+    reused = 0
+
+    try:
+        with open(temp_name, 'wb') as archive, ThreadPoolExecutor() as executor:
+            # Entries are written in walk order, while the following files are still being compressed
+            for info, record, compressed, unchanged in executor.map(pack_file, _files_to_pack()):
+                manifest[info.filename] = record
+                written.append((info, archive.tell()))
+                archive.write(_local_header(info))
+                archive.write(compressed)
+                reused += unchanged
+
+            comment = json.dumps(manifest, separators=(',', ':')).encode()
+            _write_central_directory(archive, written, comment if len(comment) <= zipfile.ZIP_MAX_COMMENT else b'')
+
+        # Remove old archive
+        for item in os.listdir('.'):
+            if item.endswith(".zip"):
+                os.remove(item)
+
+        os.replace(temp_name, archive_name)
+    finally:
+        # Left behind only if packing failed
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+
+    print(f'Submission created! ({len(manifest)} files, {reused} unchanged)')
+
+
+def _pack_file(paths, previous_archive, previous_manifest, previous_entries):
+    # Returns (entry info, manifest record, compressed contents, whether the previous entry was reused)
+    file_path, archive_path = paths
+    stat = os.stat(file_path)
+    previous = previous_manifest.get(archive_path)
+    old_info = previous_entries.get(archive_path)
+
+    # Entries that were stored uncompressed are compressed again
+    if old_info is not None and old_info.compress_type != zipfile.ZIP_DEFLATED:
+        old_info = None
+
+    # Older archives record only the SHA-256 of a file
+    if not isinstance(previous, list):
+        previous = [previous, None, None]
+
+    if old_info is not None and previous[1:] == [stat.st_size, stat.st_mtime_ns]:
+        return old_info, previous, _read_compressed(previous_archive, old_info), True
+
+    with open(file_path, 'rb') as file:
+        data = file.read()
+
+    record = [hashlib.sha256(data).hexdigest(), stat.st_size, stat.st_mtime_ns]
+    if old_info is not None and previous[0] == record[0]:
+        return old_info, record, _read_compressed(previous_archive, old_info), True
+
+    info = zipfile.ZipInfo.from_file(file_path, archive_path, strict_timestamps=False)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.CRC = zlib.crc32(data)
+    info.file_size = len(data)
+
+    # A raw deflate stream, as stored in zip entries
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    info.compress_size = len(compressed)
+
+    return info, record, compressed, False
 
-    # Create a new zip archive with the current date and time
-    with zipfile.ZipFile(f'submission-{dt}.zip', 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Walk through all files and directories in the current working directory
-        for root, dirs, files in os.walk(os.getcwd()):
-            for file in files:
+
+def _read_compressed(archive, info):
+    # Returns the still compressed contents of an entry of archive, which follow its local header
+    with open(archive, 'rb') as file:
+        file.seek(info.header_offset)
+        header = LOCAL_HEADER.unpack(file.read(LOCAL_HEADER.size))
+        if header[0] != LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f'Bad local header of {info.filename} in {archive}')
+
+        name_length, extra_length = header[-2:]
+        file.seek(name_length + extra_length, os.SEEK_CUR)
+        return file.read(info.compress_size)
+
+
+def _encode(info):
+    # Returns the encoded entry name and the general purpose flags, marking UTF-8 names like zipfile
+    try:
+        return info.filename.encode('ascii'), 0
+    except UnicodeEncodeError:
+        return info.filename.encode('utf-8'), UTF8_FLAG
+
+
+def _dos_date_time(info):
+    year, month, day, hour, minute, second = info.date_time
+    return hour << 11 | minute << 5 | second // 2, (year - 1980) << 9 | month << 5 | day
+
+
+def _local_header(info):
+    name, flags = _encode(info)
+    if max(info.compress_size, info.file_size) > zipfile.ZIP64_LIMIT:
+        raise zipfile.LargeZipFile(f'{info.filename} is too large to pack')
+
+    return LOCAL_HEADER.pack(
+        LOCAL_HEADER_SIGNATURE, info.extract_version, 0, flags, info.compress_type, *_dos_date_time(info),
+        info.CRC, info.compress_size, info.file_size, len(name), 0,
+    ) + name
+
+
+def _write_central_directory(archive, written, comment):
+    # Writes the central directory of the (info, header offset) entries and the end of central directory record
+    start = archive.tell()
+    if start > zipfile.ZIP64_LIMIT or len(written) > zipfile.ZIP_FILECOUNT_LIMIT:
+        raise zipfile.LargeZipFile('The submission is too large to pack')
+
+    for info, offset in written:
+        name, flags = _encode(info)
+        archive.write(CENTRAL_HEADER.pack(
+            CENTRAL_HEADER_SIGNATURE, info.create_version, info.create_system, info.extract_version, 0,
+            flags, info.compress_type, *_dos_date_time(info), info.CRC, info.compress_size, info.file_size,
+            len(name), 0, 0, 0, 0, info.external_attr, offset,
+        ) + name)
+
+    archive.write(END_OF_CENTRAL_DIRECTORY.pack(
+        END_OF_CENTRAL_DIRECTORY_SIGNATURE, 0, 0, len(written), len(written),
+        archive.tell() - start, start, len(comment),
+    ) + comment)
+
+
+def _files_to_pack():
+    # Yields (file path, archive path) for every file that belongs in the submission
+    cwd = os.getcwd()
+
+    for root, dirs, files in os.walk(cwd):
+        dirs[:] = sorted(
+            directory for directory in dirs
+            if directory not in EXCLUDED_DIRS and 'venv' not in directory
+        )
+        current_dir = os.path.basename(root)
+
+        for file in sorted(files):
+            # Add specific files and directories to the archive
+            if file in PACKED_FILES or current_dir in PACKED_DIRS:
                 file_path = os.path.join(root, file)
-                archive_path = os.path.relpath(file_path, os.getcwd())
-                current_dir = os.path.basename(root)
+                yield file_path, os.path.relpath(file_path, cwd)
+
+
+def _latest_archive():
+    archives = glob.glob('submission-*.zip')
+    return max(archives, key=os.path.getmtime) if archives else None
 
-                # Add specific files and directories to the archive
-                if file in ['requirements.txt', 'manage.py', 'caller.py'] \
-                        or current_dir in ['main_app', 'orm_skeleton', 'migrations']:
-                    if 'venv' not in file_path:
-                        zipf.write(file_path, archive_path)
 
-    print('Submission created!')
+def _read_previous(archive):
+    # Returns the manifest of a previous archive and its entries by name
+    try:
+        with zipfile.ZipFile(archive) as zipf:
+            return json.loads(zipf.comment or b'{}'), {info.filename: info for info in zipf.infolist()}
+    except (zipfile.BadZipFile, ValueError):
+        return {}, {}
 
 
 if __name__ == '__main__':
-    pack()
\ No newline at end of file
+    pack()
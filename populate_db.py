@@ -1,14 +1,127 @@
+import os
 import random
+from graphlib import TopologicalSorter, CycleError
 from _decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor
 
+import django
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import transaction, connections, DEFAULT_DB_ALIAS
 from django.db.models import AutoField, PositiveIntegerField, BooleanField, CharField, TextField, EmailField, \
-    DecimalField, DateField, IntegerField
-from django.db.models.fields.related import ForeignKey, OneToOneField, ManyToManyField
+    DecimalField, DateField, IntegerField, FloatField, PositiveSmallIntegerField, PositiveBigIntegerField
+from django.db.models import Max
+from django.db.models.fields import NOT_PROVIDED
+from django.db.models.fields.related import ForeignKey, OneToOneField
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 
+# Returned by generate_field_value for fields that should be left to the database (e.g. AutoField)
+SKIP = object()
+
+# Upper bound for generated dates in seeded runs, so the same seed produces the same dataset on any day
+SEEDED_TODAY = date(2024, 12, 31)
+
+# The related key pools of a worker process of parallel_populate_model_with_data, set by _init_worker
+_worker_pools = {}
+
+
+def generate_field_value(model, field, index, rng=random, today=None):
+    """
+    Generates a random value for a single concrete, non-relational field.
+
+    Parameters:
+        model: The model class the field belongs to.
+        field: The model field to generate a value for.
+        index (int): The zero-based number of the record being generated.
+        rng: The source of randomness, either the random module or a random.Random instance.
+        today (date): The upper bound for generated dates. Defaults to the current date.
+
+    Returns:
+        The generated value, or SKIP if the field should not be set.
+    """
+    if getattr(field, 'db_default', NOT_PROVIDED) is not NOT_PROVIDED:
+        return SKIP  # Skip fields computed by the database
+    elif not field.editable:
+        return SKIP  # Skip fields maintained by the application, e.g. denormalized counters
+    elif hasattr(field, 'choices') and field.choices:
+        random_choice = rng.choice(field.choices)
+        return random_choice[0]
+    elif isinstance(field, AutoField):
+        return SKIP  # Skip AutoField
+    elif isinstance(field, (PositiveIntegerField, PositiveSmallIntegerField, PositiveBigIntegerField)):
+        return rng.randint(1, 100)
+    elif isinstance(field, IntegerField):
+        return rng.randint(-100, 100)
+    elif isinstance(field, FloatField):
+        return round(rng.uniform(0, 1000), 2)
+    elif isinstance(field, BooleanField):
+        return rng.choice([True, False])
+    elif isinstance(field, CharField) or isinstance(field, TextField):
+        value = f"{model.__name__} {index + 1}"
+        if field.max_length and len(value) > field.max_length:
+            # The record number keeps the values distinct, so the model name is shortened instead
+            number = str(index + 1)
+            prefix = model.__name__[:max(field.max_length - len(number) - 1, 0)]
+            value = f"{prefix} {number}".lstrip()[-field.max_length:]
+        return value
+    elif isinstance(field, EmailField):
+        return f"{rng.choice(['user', 'admin', 'customer'])}@example.com"
+    elif isinstance(field, DecimalField):
+        max_digits = field.max_digits
+        decimal_places = field.decimal_places
+        random_decimal = rng.uniform(1, 10 ** (max_digits - decimal_places))
+        return Decimal(f"{random_decimal:.{decimal_places}f}")
+    elif isinstance(field, DateField):
+        start_date = datetime(2000, 1, 1).date()
+        end_date = today or datetime.today().date()
+        delta = end_date - start_date
+        random_days = rng.randint(0, delta.days)
+        return start_date + timedelta(days=random_days)
+
+    return SKIP
+
+
+def load_related_pool(related_model, pools=None):
+    """
+    Returns the primary keys of all rows of related_model, querying the database only once per model.
+
+    Parameters:
+        related_model: The model whose primary keys should be loaded.
+        pools (dict): Optional cache of {model: [pk, ...]} shared between calls.
+
+    Returns:
+        list: The primary keys of related_model, ordered by pk.
+    """
+    if pools is None:
+        pools = {}
+
+    if related_model not in pools:
+        pools[related_model] = list(
+            related_model.objects.order_by('pk').values_list('pk', flat=True)
+        )
+
+    return pools[related_model]
+
+
+def populate_model_with_data(model, num_records=10, bulk=False, batch_size=1000, pools=None):
+    """
+    Populates a model with randomly generated records.
+
+    Parameters:
+        model: The model class to populate.
+        num_records (int): The number of records to create.
+        bulk (bool): If True, rows are written with chunked bulk_create and related keys are picked
+            from in-memory pools instead of querying the database for every row.
+        batch_size (int): The number of rows written per bulk_create call. Only used in bulk mode.
+        pools (dict): Optional {model: [pk, ...]} cache of related keys. Only used in bulk mode.
+
+    Returns:
+        list: The primary keys of the created records in bulk mode, otherwise None.
+    """
+    if bulk:
+        return bulk_populate_model_with_data(model, num_records, batch_size, pools)
 
-def populate_model_with_data(model, num_records=10):
     model_fields = model._meta.fields
     many_to_many_fields = model._meta.local_many_to_many
 
@@ -17,35 +130,14 @@ def populate_model_with_data(model, num_records=10):
 
         # Iterate through the fields to gather values
         for field in model_fields:
-            if hasattr(field, 'choices') and field.choices:
-                random_choice = random.choice(field.choices)
-                field_values[field.name] = random_choice[0]
-            elif isinstance(field, AutoField):
-                continue  # Skip AutoField
-            elif isinstance(field, PositiveIntegerField):
-                field_values[field.name] = random.randint(1, 100)
-            elif isinstance(field, IntegerField):
-                field_values[field.name] = random.randint(-100, 100)
-            elif isinstance(field, BooleanField):
-                field_values[field.name] = random.choice([True, False])
-            elif isinstance(field, CharField) or isinstance(field, TextField):
-                field_values[field.name] = f"{model.__name__} {_+1}"
-            elif isinstance(field, EmailField):
-                field_values[field.name] = f"{random.choice(['user', 'admin', 'customer'])}@example.com"
-            elif isinstance(field, DecimalField):
-                max_digits = field.max_digits
-                decimal_places = field.decimal_places
-                random_decimal = random.uniform(1, 10 ** (max_digits - decimal_places))
-                field_values[field.name] = Decimal(f"{random_decimal:.{decimal_places}f}")
-            elif isinstance(field, DateField):
-                start_date = datetime(2000, 1, 1).date()
-                end_date = datetime.today().date()
-                delta = end_date - start_date
-                random_days = random.randint(0, delta.days)
-                field_values[field.name] = start_date + timedelta(days=random_days)
-            elif isinstance(field, ForeignKey) or isinstance(field, OneToOneField):
+            if isinstance(field, ForeignKey) or isinstance(field, OneToOneField):
                 related_model = field.related_model
                 field_values[field.name] = related_model.objects.order_by('?').first()
+                continue
+
+            value = generate_field_value(model, field, _)
+            if value is not SKIP:
+                field_values[field.name] = value
 
         # Create the model instance
         instance = model.objects.create(**field_values)
@@ -54,4 +146,513 @@ def populate_model_with_data(model, num_records=10):
         for field in many_to_many_fields:
             related_model = field.related_model
             related_instances = related_model.objects.order_by('?')[:random.randint(1, 5)]
-            getattr(instance, field.name).set(related_instances)
\ No newline at end of file
+            getattr(instance, field.name).set(related_instances)
+
+
+def load_one_to_one_pools(model, pools=None, rng=random):
+    """
+    Returns a shuffled copy of the related key pool for every OneToOneField of model.
+
+    O2O targets can be used only once, so build_instance() hands them out by popping from these lists.
+    """
+    one_to_one_pools = {}
+    for field in model._meta.fields:
+        if isinstance(field, OneToOneField):
+            pool = load_related_pool(field.related_model, pools)
+            one_to_one_pools[field] = rng.sample(pool, k=len(pool))
+
+    return one_to_one_pools
+
+
+def build_instance(model, index, pools, one_to_one_pools, rng=random, today=None):
+    """
+    Builds an unsaved model instance with random values, picking related keys from the in-memory pools.
+
+    Parameters:
+        model: The model class to instantiate.
+        index (int): The zero-based number of the record being generated.
+        pools (dict): {model: [pk, ...]} cache of related keys.
+        one_to_one_pools (dict): The result of load_one_to_one_pools(model, pools).
+        rng: The source of randomness, either the random module or a random.Random instance.
+        today (date): The upper bound for generated dates.
+
+    Returns:
+        The unsaved model instance.
+    """
+    field_values = {}
+
+    for field in model._meta.fields:
+        if isinstance(field, OneToOneField):
+            available = one_to_one_pools[field]
+            field_values[field.attname] = available.pop() if available else None
+            continue
+        elif isinstance(field, ForeignKey):
+            pool = load_related_pool(field.related_model, pools)
+            field_values[field.attname] = rng.choice(pool) if pool else None
+            continue
+
+        value = generate_field_value(model, field, index, rng, today)
+        if value is not SKIP:
+            field_values[field.name] = value
+
+    return model(**field_values)
+
+
+def bulk_populate_model_with_data(model, num_records=10, batch_size=1000, pools=None, rng=random, start=0,
+                                  one_to_one_pools=None, today=None, first_pk=None):
+    """
+    Populates a model with randomly generated records using chunked bulk inserts.
+
+    The primary keys of every FK, O2O and M2M target are loaded once into memory and random
+    related values are picked from there. Many-to-many links are written straight into the
+    through table in batches.
+
+    Parameters:
+        model: The model class to populate.
+        num_records (int): The number of records to create.
+        batch_size (int): The number of rows written per bulk_create call.
+        pools (dict): Optional {model: [pk, ...]} cache of related keys shared between calls.
+            If the populated model itself is in the cache, the new keys are appended to it.
+        rng: The source of randomness, either the random module or a random.Random instance.
+        start (int): The index of the first generated record, used for the generated names.
+        one_to_one_pools (dict): Optional pre-shuffled O2O pools, see load_one_to_one_pools.
+        today (date): The upper bound for generated dates.
+        first_pk (int): If given, the record with index i gets the primary key first_pk + i
+            instead of one assigned by the database.
+
+    Returns:
+        list: The primary keys of the created records.
+    """
+    if pools is None:
+        pools = {}
+    if one_to_one_pools is None:
+        one_to_one_pools = load_one_to_one_pools(model, pools, rng)
+
+    many_to_many_fields = model._meta.local_many_to_many
+    stop = start + num_records
+    created_pks = []
+
+    for batch_start in range(start, stop, batch_size):
+        instances = []
+        for index in range(batch_start, min(batch_start + batch_size, stop)):
+            instance = build_instance(model, index, pools, one_to_one_pools, rng, today)
+            if first_pk is not None:
+                instance.pk = first_pk + index
+            instances.append(instance)
+
+        with transaction.atomic():
+            instances = model.objects.bulk_create(instances, batch_size=batch_size)
+            batch_pks = [instance.pk for instance in instances]
+
+            for field in many_to_many_fields:
+                bulk_link_many_to_many(field, batch_pks, batch_size, pools, rng)
+
+        created_pks.extend(batch_pks)
+
+    if model in pools:
+        pools[model].extend(created_pks)
+
+    return created_pks
+
+
+def bulk_link_many_to_many(field, source_pks, batch_size=1000, pools=None, rng=random):
+    """
+    Links every source row to 1-5 random related rows by inserting directly into the through table.
+
+    Parameters:
+        field (ManyToManyField): The many-to-many field to populate.
+        source_pks (list): The primary keys of the rows owning the field.
+        batch_size (int): The number of through rows written per bulk_create call.
+        pools (dict): Optional {model: [pk, ...]} cache of related keys.
+        rng: The source of randomness, either the random module or a random.Random instance.
+    """
+    pool = load_related_pool(field.related_model, pools)
+    if not pool:
+        return
+
+    through = field.remote_field.through
+    source_column = f"{field.m2m_field_name()}_id"
+    target_column = f"{field.m2m_reverse_field_name()}_id"
+
+    links = []
+    for source_pk in source_pks:
+        for target_pk in rng.sample(pool, k=min(rng.randint(1, 5), len(pool))):
+            links.append(through(**{source_column: source_pk, target_column: target_pk}))
+
+    through.objects.bulk_create(links, batch_size=batch_size, ignore_conflicts=True)
+
+
+def generate_rows(model, num_records=10, pools=None, connection=None):
+    """
+    Yields randomly generated rows for model as tuples of database-ready column values.
+
+    Values are produced exactly like bulk_populate_model_with_data does and then passed through
+    field.pre_save() and field.get_db_prep_save(), so defaults, auto_now fields, choices,
+    DecimalField and DateField values match what the ORM itself would write.
+
+    Parameters:
+        model: The model class to generate rows for.
+        num_records (int): The number of rows to generate.
+        pools (dict): Optional {model: [pk, ...]} cache of related keys.
+        connection: The database connection the values are prepared for.
+
+    Returns:
+        generator: Tuples ordered like copy_columns(model).
+    """
+    if pools is None:
+        pools = {}
+    if connection is None:
+        connection = connections[DEFAULT_DB_ALIAS]
+
+    columns = copy_columns(model)
+    one_to_one_pools = load_one_to_one_pools(model, pools)
+
+    for index in range(num_records):
+        instance = build_instance(model, index, pools, one_to_one_pools)
+
+        yield tuple(
+            field.get_db_prep_save(field.pre_save(instance, True), connection)
+            for field in columns
+        )
+
+
+def copy_columns(model):
+    """
+    Returns the concrete fields written by the COPY loader, i.e. every column except an AutoField pk
+    and the columns with a database default.
+    """
+    return [
+        field for field in model._meta.concrete_fields
+        if not isinstance(field, AutoField) and getattr(field, 'db_default', NOT_PROVIDED) is NOT_PROVIDED
+    ]
+
+
+def _copy_value(value):
+    # Encodes a single value in PostgreSQL's COPY text format
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+class CopyStream:
+    """
+    A read-only file-like object that encodes rows into COPY text format on demand.
+
+    psycopg2's copy_expert() pulls data with read(size), so rows are generated only as fast as
+    the server consumes them and the whole dataset never has to fit in memory.
+    """
+
+    def __init__(self, rows):
+        self._lines = (
+            ('\t'.join(_copy_value(value) for value in row) + '\n').encode()
+            for row in rows
+        )
+        self._buffer = bytearray()
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+
+        if size < 0:
+            size = len(self._buffer)
+
+        chunk = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return chunk
+
+    def __iter__(self):
+        return self._lines
+
+
+def copy_model_with_data(model, num_records=10, pools=None, using=DEFAULT_DB_ALIAS):
+    """
+    Populates a model with randomly generated records using PostgreSQL's COPY ... FROM STDIN.
+
+    Rows are streamed to the server as they are generated, which removes the per-statement
+    overhead of INSERTs. Many-to-many links are added afterwards through the through table.
+    On databases other than PostgreSQL the bulk_create path is used instead.
+
+    Parameters:
+        model: The model class to populate.
+        num_records (int): The number of records to create.
+        pools (dict): Optional {model: [pk, ...]} cache of related keys shared between calls.
+        using (str): The database alias to load into.
+
+    Returns:
+        list: The primary keys of the created records.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return bulk_populate_model_with_data(model, num_records, pools=pools)
+
+    if pools is None:
+        pools = {}
+
+    quote_name = connection.ops.quote_name
+    columns = copy_columns(model)
+    sql = (
+        f"COPY {quote_name(model._meta.db_table)} "
+        f"({', '.join(quote_name(field.column) for field in columns)}) FROM STDIN"
+    )
+    rows = generate_rows(model, num_records, pools, connection)
+
+    with transaction.atomic(using=using):
+        last_pk = model.objects.using(using).aggregate(last_pk=Max('pk'))['last_pk']
+
+        with connection.cursor() as cursor:
+            raw_cursor = cursor.cursor
+
+            if hasattr(raw_cursor, 'copy_expert'):
+                # psycopg2
+                raw_cursor.copy_expert(sql, CopyStream(rows))
+            else:
+                # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    for line in CopyStream(rows):
+                        copy.write(line)
+
+        created = model.objects.using(using).order_by('pk')
+        if last_pk is not None:
+            created = created.filter(pk__gt=last_pk)
+        created_pks = list(created.values_list('pk', flat=True))
+
+        for field in model._meta.local_many_to_many:
+            bulk_link_many_to_many(field, created_pks, pools=pools)
+
+    if model in pools:
+        pools[model].extend(created_pks)
+
+    return created_pks
+
+
+def related_models(model):
+    """
+    Returns the set of models referenced by the FK, O2O and M2M fields of model, excluding model itself.
+    """
+    fields = list(model._meta.fields) + list(model._meta.local_many_to_many)
+
+    return {
+        field.related_model
+        for field in fields
+        if field.is_relation and field.related_model is not None and field.related_model is not model
+    }
+
+
+def parallel_populate_model_with_data(model, num_records=10, seed=0, partition_size=10000, workers=None,
+                                      batch_size=1000, pools=None, today=SEEDED_TODAY):
+    """
+    Populates a model with deterministic random records generated and inserted by a pool of processes.
+
+    num_records is split into partitions of partition_size records. Every partition gets its own
+    random.Random seeded from (seed, partition number) and is written by a worker process on its own
+    database connection with bulk_create. Related key pools, including the model's own keys for
+    self-referencing relations, are loaded once here and sent to every worker once, when it starts.
+    O2O targets are shuffled once and sliced between partitions so they are never reused.
+
+    Primary keys are assigned here, continuing from the current maximum, and the table's sequence is
+    reset afterwards. The generated rows therefore depend only on seed, num_records, partition_size,
+    batch_size, today and the rows already in the database - not on the number of workers or the order
+    they finish in. auto_now timestamps are the only values that differ between runs.
+
+    Parameters:
+        model: The model class to populate.
+        num_records (int): The number of records to create.
+        seed: The seed of the dataset.
+        partition_size (int): The number of records generated by a single task.
+        workers (int): The number of worker processes. Defaults to os.cpu_count().
+        batch_size (int): The number of rows written per bulk_create call.
+        pools (dict): Optional {model: [pk, ...]} cache of related keys shared between calls.
+        today (date): The upper bound for generated dates.
+
+    Returns:
+        list: The primary keys of the created records, in partition order.
+    """
+    if pools is None:
+        pools = {}
+
+    # Self-referencing relations pick from the rows that existed before, not from other workers' new rows
+    fields = list(model._meta.fields) + list(model._meta.local_many_to_many)
+    pool_models = related_models(model)
+    if any(field.is_relation and field.related_model is model for field in fields):
+        pool_models.add(model)
+
+    for related_model in pool_models:
+        load_related_pool(related_model, pools)
+
+    one_to_one_pools = load_one_to_one_pools(model, pools, random.Random(f"{seed}:one-to-one"))
+    pool_labels = {related_model._meta.label: pools[related_model] for related_model in pool_models}
+    first_pk = (model.objects.aggregate(last_pk=Max('pk'))['last_pk'] or 0) + 1
+
+    tasks = []
+    for partition, start in enumerate(range(0, num_records, partition_size)):
+        stop = min(start + partition_size, num_records)
+        partition_one_to_one_pools = {
+            field.name: available[start:stop] for field, available in one_to_one_pools.items()
+        }
+        tasks.append(
+            (model._meta.label, start, stop, f"{seed}:{partition}", batch_size,
+             partition_one_to_one_pools, today, first_pk)
+        )
+
+    # Forked workers must not share the parent's open database connections
+    connections.close_all()
+
+    created_pks = []
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(pool_labels,),
+    ) as executor:
+        futures = [executor.submit(_populate_partition, *task) for task in tasks]
+        for future in futures:
+            created_pks.extend(future.result())
+
+    connection = connections[DEFAULT_DB_ALIAS]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+            cursor.execute(sql)
+
+    if model in pools:
+        pools[model].extend(created_pks)
+
+    return created_pks
+
+
+def _init_worker(pool_labels):
+    # Spawned workers have to set Django up themselves, forked ones only need fresh connections
+    django.setup()
+    connections.close_all()
+
+    _worker_pools.clear()
+    _worker_pools.update({apps.get_model(label): pks for label, pks in pool_labels.items()})
+
+
+def _populate_partition(label, start, stop, partition_seed, batch_size, one_to_one_pools, today, first_pk):
+    model = apps.get_model(label)
+    # bulk_populate_model_with_data() appends the new keys to the model's own pool, which must not
+    # leak into the next partition handled by this worker
+    pools = dict(_worker_pools)
+    if model in pools:
+        pools[model] = list(pools[model])
+    one_to_one_pools = {model._meta.get_field(name): available for name, available in one_to_one_pools.items()}
+
+    try:
+        return bulk_populate_model_with_data(
+            model,
+            num_records=stop - start,
+            batch_size=batch_size,
+            pools=pools,
+            rng=random.Random(partition_seed),
+            start=start,
+            one_to_one_pools=one_to_one_pools,
+            today=today,
+            first_pk=first_pk,
+        )
+    finally:
+        connections.close_all()
+
+
+def seeding_order(models):
+    """
+    Sorts models so that every model comes after the models its FK, O2O and M2M fields point to.
+
+    If the relations form a cycle, edges coming from nullable FKs and M2M fields are ignored,
+    since those rows can be created before their targets exist.
+
+    Parameters:
+        models: The model classes to sort.
+
+    Returns:
+        list: The model classes in dependency order.
+    """
+    models = list(models)
+
+    def build_graph(required_only):
+        graph = {}
+        for model in models:
+            dependencies = set()
+            for field in list(model._meta.fields) + list(model._meta.local_many_to_many):
+                if not field.is_relation or field.related_model not in models or field.related_model is model:
+                    continue
+                if required_only and (field.null or field.many_to_many):
+                    continue
+                dependencies.add(field.related_model)
+            graph[model] = dependencies
+        return graph
+
+    try:
+        return list(TopologicalSorter(build_graph(required_only=False)).static_order())
+    except CycleError:
+        return list(TopologicalSorter(build_graph(required_only=True)).static_order())
+
+
+def populate_app_with_data(app_label='main_app', counts=None, default_count=10, method='bulk', seed=0,
+                           batch_size=1000, exclude=None):
+    """
+    Populates every model of an app in dependency order, e.g. Spacecraft and Astronaut before Mission.
+
+    The primary keys of every model are loaded once up front and the keys created by each stage are
+    appended to the shared pools, so later stages pick related rows without querying again.
+
+    Models computed from other rows or used for bookkeeping are left out: the app config can list them
+    in unseeded_models. The loaders bypass signals, so afterwards the app config's
+    rebuild_derived_data(), if it has one, recomputes the denormalized data from the seeded rows.
+
+    Parameters:
+        app_label (str): The label of the app to populate.
+        counts (dict): The number of records per model, keyed by model name (e.g. {'Mission': 1000}).
+        default_count (int): The number of records for models missing from counts.
+        method (str): 'bulk' for chunked bulk_create, 'copy' for PostgreSQL COPY or
+            'parallel' for seeded multi-process generation.
+        seed: The seed of the dataset. Only used with method='parallel'.
+        batch_size (int): The number of rows written per bulk_create call.
+        exclude (iterable): The names of the models not to seed. Defaults to the app config's unseeded_models.
+
+    Returns:
+        dict: The primary keys of the created records, keyed by model class.
+    """
+    if counts is None:
+        counts = {}
+
+    app_config = apps.get_app_config(app_label)
+    if exclude is None:
+        exclude = getattr(app_config, 'unseeded_models', ())
+
+    models = [
+        model for model in app_config.get_models()
+        if not model._meta.auto_created and model.__name__ not in exclude
+    ]
+    pools = {}
+    for model in models:
+        load_related_pool(model, pools)
+
+    created = {}
+    for model in seeding_order(models):
+        num_records = counts.get(model.__name__, default_count)
+
+        if method == 'copy':
+            created[model] = copy_model_with_data(model, num_records, pools)
+        elif method == 'parallel':
+            created[model] = parallel_populate_model_with_data(
+                model, num_records, seed, batch_size=batch_size, pools=pools
+            )
+        else:
+            created[model] = bulk_populate_model_with_data(model, num_records, batch_size, pools)
+
+    rebuild_derived_data = getattr(app_config, 'rebuild_derived_data', None)
+    if rebuild_derived_data is not None:
+        rebuild_derived_data()
+
+    return created
@@ -1,4 +1,17 @@
+import atexit
+import logging
+import os
+import re
+import sys
+import time
+import warnings
+from collections import OrderedDict, Counter, deque
+from contextlib import contextmanager
+from functools import lru_cache
+
 # Should be put in settings.py after "AUTH_PASSWORD_VALIDATORS"
+# 'sql_logging.QueryProfileHandler' needs this file to be importable, e.g. copied next to manage.py.
+# Django only logs SQL when DEBUG = True; profile_queries() below works without it.
 
 LOGGING = {
     'version': 1,
@@ -7,6 +20,9 @@ LOGGING = {
         'console': {
             'class': 'logging.StreamHandler',
         },
+        'query_profile': {  # aggregates the sql logs and prints a summary at exit
+            'class': 'sql_logging.QueryProfileHandler',
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -14,9 +30,405 @@ LOGGING = {
     },
     'loggers': {
         'django.db.backends': {  # responsible for the sql logs
-            'handlers': ['console'],
+            'handlers': ['query_profile'],
             'level': 'DEBUG',
             'propagate': False,
         },
     },
-}
\ No newline at end of file
+}
+
+
+# How many durations are kept per statement for the p95, and how many statements are tracked at once
+SAMPLE_SIZE = 1000
+MAX_ENTRIES = 500
+
+# Runs after literals have become '?', so lists of inlined parameters collapse like %s placeholders do
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+_FROM_TABLE_RE = re.compile(r'\bFROM\s+"(?P<table>\w+)"', re.IGNORECASE)
+_WHERE_COLUMN_RE = re.compile(r'\bWHERE\s+\(*"(?P<table>\w+)"\."(?P<column>\w+)"\s*(?:=|IN\b)', re.IGNORECASE)
+
+# Frames from these locations are skipped when looking for the code that issued a query
+_SKIPPED_PATHS = (
+    os.path.dirname(logging.__file__),
+    contextmanager.__code__.co_filename,
+    os.sep + 'django' + os.sep,
+    __file__,
+)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    """
+    Normalizes a SQL statement so that statements differing only in their parameters compare equal.
+
+    Parameters:
+        sql (str): The SQL statement, with or without inlined parameters.
+
+    Returns:
+        str: The statement with literals replaced by '?' and IN lists collapsed.
+    """
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+def call_site():
+    """
+    Returns 'file:line in function' for the innermost frame outside Django, logging and this module.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not any(path in filename for path in _SKIPPED_PATHS):
+            return f'{os.path.relpath(filename)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+
+    return '<unknown>'
+
+
+class QueryStats:
+    """
+    Aggregated timings of one statement fingerprint issued from one call site.
+
+    Attributes:
+        count (int): The number of times the statement was executed.
+        total (float): The total execution time in seconds.
+        rows (int): The total number of rows returned or affected, when known.
+        durations (deque): The most recent SAMPLE_SIZE durations, used for the p95.
+    """
+
+    __slots__ = ('count', 'total', 'rows', 'durations')
+
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.durations = deque(maxlen=sample_size)
+
+    def add(self, duration, rows=None):
+        self.count += 1
+        self.total += duration
+        self.durations.append(duration)
+        if rows is not None and rows > 0:
+            self.rows += rows
+
+    @property
+    def p95(self):
+        samples = sorted(self.durations)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+class QueryProfile:
+    """
+    A bounded, in-memory aggregate of executed statements keyed by (call site, fingerprint).
+
+    When more than max_entries keys are tracked, the least recently seen one is dropped.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, sample_size=SAMPLE_SIZE):
+        self.max_entries = max_entries
+        self.sample_size = sample_size
+        self.entries = OrderedDict()
+
+    def record(self, sql, duration, rows=None, site=None):
+        key = (site or call_site(), fingerprint(sql))
+
+        stats = self.entries.get(key)
+        if stats is None:
+            stats = self.entries[key] = QueryStats(self.sample_size)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+
+        stats.add(duration, rows)
+
+    def clear(self):
+        self.entries.clear()
+
+    def summary(self, limit=20):
+        """
+        Returns a text table of the statements with the highest total time.
+
+        Parameters:
+            limit (int): The maximum number of rows in the table.
+
+        Returns:
+            str: The formatted table, or an empty string if nothing was recorded.
+        """
+        if not self.entries:
+            return ''
+
+        ranked = sorted(self.entries.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+
+        lines = [
+            f"{'count':>7} {'total ms':>10} {'avg ms':>8} {'p95 ms':>8} {'rows':>8}  call site / statement",
+        ]
+        for (site, statement), stats in ranked:
+            lines.append(
+                f'{stats.count:>7} '
+                f'{stats.total * 1000:>10.2f} '
+                f'{stats.total * 1000 / stats.count:>8.2f} '
+                f'{stats.p95 * 1000:>8.2f} '
+                f'{stats.rows:>8}  '
+                f'{site}'
+            )
+            lines.append(f"{'':>46}{statement[:120]}")
+
+        return '\n'.join(lines)
+
+    def print_summary(self, limit=20, stream=None):
+        summary = self.summary(limit)
+        if summary:
+            print(summary, file=stream or sys.stderr)
+
+
+class QueryProfileHandler(logging.Handler):
+    """
+    A logging handler for 'django.db.backends' that aggregates statements instead of printing them.
+
+    A summary table of the slowest statements is printed when the process exits.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, sample_size=SAMPLE_SIZE, limit=20):
+        super().__init__()
+        self.profile = QueryProfile(max_entries, sample_size)
+        atexit.register(self.profile.print_summary, limit)
+
+    def emit(self, record):
+        sql = getattr(record, 'sql', None)
+        duration = getattr(record, 'duration', None)
+        if sql is None or duration is None:
+            return
+
+        self.profile.record(sql, duration)
+
+
+@contextmanager
+def profile_queries(using='default', limit=20, print_summary=True):
+    """
+    Aggregates every statement executed on a connection inside the block, with row counts.
+
+    Unlike QueryProfileHandler this hooks into connection.execute_wrapper(), so it works with DEBUG = False.
+
+    Parameters:
+        using (str): The database alias to profile.
+        limit (int): The maximum number of statements in the printed summary.
+        print_summary (bool): Whether to print the summary table when the block exits.
+
+    Yields:
+        QueryProfile: The profile being filled.
+
+    Example:
+        with profile_queries():
+            get_top_astronaut()
+    """
+    from django.db import connections
+
+    profile = QueryProfile()
+
+    def wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            profile.record(sql, time.perf_counter() - start, context['cursor'].rowcount)
+
+    with connections[using].execute_wrapper(wrapper):
+        try:
+            yield profile
+        finally:
+            if print_summary:
+                profile.print_summary(limit)
+
+
+class NPlusOneWarning(UserWarning):
+    pass
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+class NPlusOneFinding:
+    """
+    A statement that was repeated more than the allowed number of times inside one call.
+
+    Attributes:
+        statement (str): The fingerprint of the repeated statement.
+        count (int): How many times it was executed.
+        site (str): The call site that executed it.
+        suggestion (str): The select_related/prefetch_related call that would remove the repetition, if known.
+    """
+
+    def __init__(self, statement, count, site, suggestion):
+        self.statement = statement
+        self.count = count
+        self.site = site
+        self.suggestion = suggestion
+
+    def __str__(self):
+        hint = f' Use {self.suggestion}.' if self.suggestion else ''
+        return f'N+1 queries: {self.count} x "{self.statement[:120]}" at {self.site}.{hint}'
+
+
+def suggest_relation(sql):
+    """
+    Guesses which relation a repeated statement loads, from the table and column it filters on.
+
+    Parameters:
+        sql (str): The repeated SQL statement.
+
+    Returns:
+        str: e.g. "Author.objects.prefetch_related('books')", or None if the relation is not recognized.
+    """
+    from django.apps import apps
+
+    where = _WHERE_COLUMN_RE.search(sql)
+    if where is None:
+        return None
+
+    table, column = where.group('table'), where.group('column')
+    models = {model._meta.db_table: model for model in apps.get_models(include_auto_created=True)}
+    model = models.get(table)
+    if model is None:
+        return None
+
+    # Filtering the M2M through table on one side means the other side is loaded per row
+    if model._meta.auto_created:
+        for owner in apps.get_models():
+            for field in owner._meta.local_many_to_many:
+                if field.remote_field.through is not model:
+                    continue
+                if column == field.m2m_column_name():
+                    return f"{owner.__name__}.objects.prefetch_related('{field.name}')"
+                return (
+                    f"{field.related_model.__name__}.objects"
+                    f".prefetch_related('{field.remote_field.get_accessor_name()}')"
+                )
+        return None
+
+    # Filtering on the primary key means a forward FK/O2O is followed per row
+    if column == model._meta.pk.column:
+        candidates = [
+            f"{owner.__name__}.objects.select_related('{field.name}')"
+            for owner in apps.get_models()
+            for field in owner._meta.fields
+            if field.is_relation and field.related_model is model and (field.many_to_one or field.one_to_one)
+        ]
+        return ' or '.join(candidates) or None
+
+    # Filtering on a FK column means the reverse side of that FK is accessed per row
+    for field in model._meta.fields:
+        if field.is_relation and field.column == column:
+            method = 'select_related' if field.one_to_one else 'prefetch_related'
+            return (
+                f"{field.related_model.__name__}.objects"
+                f".{method}('{field.remote_field.get_accessor_name()}')"
+            )
+
+    return None
+
+
+@contextmanager
+def detect_n_plus_one(threshold=5, raise_error=False, using='default'):
+    """
+    Detects statements that are repeated more than threshold times inside the block.
+
+    Every repeated statement is reported once, with the select_related/prefetch_related call that
+    would most likely remove it, either as an NPlusOneWarning or by raising NPlusOneError.
+
+    Parameters:
+        threshold (int): How many executions of the same statement are allowed.
+        raise_error (bool): Whether to raise NPlusOneError instead of warning.
+        using (str): The database alias to watch.
+
+    Yields:
+        list: The NPlusOneFinding objects, filled when the block exits, also if it raises.
+
+    Example:
+        with detect_n_plus_one(raise_error=True):
+            show_all_authors_with_their_books()
+    """
+    from django.db import connections
+
+    counts = Counter()
+    samples = {}
+    findings = []
+
+    def wrapper(execute, sql, params, many, context):
+        statement = fingerprint(sql)
+        counts[statement] += 1
+        if counts[statement] == threshold + 1:
+            samples[statement] = (sql, call_site())
+        return execute(sql, params, many, context)
+
+    try:
+        with connections[using].execute_wrapper(wrapper):
+            yield findings
+    finally:
+        for statement, (sql, site) in samples.items():
+            findings.append(NPlusOneFinding(statement, counts[statement], site, suggest_relation(sql)))
+
+    if findings:
+        message = '\n'.join(str(finding) for finding in findings)
+        if raise_error:
+            raise NPlusOneError(message)
+        warnings.warn(message, NPlusOneWarning, stacklevel=3)
+
+
+def audit_module(module, threshold=5, using='default'):
+    """
+    Runs every public function of a caller module that takes no required arguments and reports N+1 queries.
+
+    Each function runs in its own transaction which is rolled back afterwards, so functions that
+    modify data leave the database unchanged. A function that raises is reported with a RuntimeWarning,
+    along with the findings collected before it failed, and the audit continues with the next one.
+
+    Parameters:
+        module: The imported caller module.
+        threshold (int): How many executions of the same statement are allowed per function.
+        using (str): The database alias to use.
+
+    Returns:
+        dict: {function name: [NPlusOneFinding, ...]} for the functions with findings.
+    """
+    import inspect
+
+    from django.db import transaction
+
+    report = {}
+
+    for name, function in inspect.getmembers(module, inspect.isfunction):
+        if name.startswith('_') or function.__module__ != module.__name__:
+            continue
+
+        parameters = inspect.signature(function).parameters.values()
+        if any(
+            parameter.default is parameter.empty
+            and parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)
+            for parameter in parameters
+        ):
+            continue
+
+        findings = []
+        try:
+            with transaction.atomic(using=using):
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', NPlusOneWarning)
+                    with detect_n_plus_one(threshold, using=using) as findings:
+                        function()
+                transaction.set_rollback(True, using=using)
+        except Exception as error:
+            warnings.warn(f'{module.__name__}.{name}() raised {error!r}.', RuntimeWarning, stacklevel=2)
+
+        if findings:
+            report[name] = findings
+
+    return report